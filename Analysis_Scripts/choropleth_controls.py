@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Data layout, hover labels and dropdown/slider controls for the OECD
+choropleth (plotly_labor_entrance_novel.py)
+
+The compact layout ships the values as one dense year x field x country
+matrix: a single choropleth trace holds the country codes once, the field
+dropdown and the year slider only restyle its z.
+"""
+
+# importing necessary libraries
+import numpy as np
+import pandas as pd
+
+
+def value_cube(df, years, fields, location="COUNTRY", label="Country", decimals=3):
+    """Return (cube, locations, names) for the compact choropleth.
+
+    cube[y, f] holds the value of fields[f] in years[y] for every entry of
+    `locations` (NaN where a country has no data that year). Values are
+    rounded to the precision shown in the hover label.
+    """
+    keys = df[location].astype(str)
+    locations = np.sort(keys.unique())
+    # first non-missing value per country and year, so both the wide layout
+    # and the one split into STEM/Non-STEM rows collapse to one row
+    per_country = df[fields].groupby([df["Year"], keys]).first()
+    per_country = per_country.reindex(pd.MultiIndex.from_product([years, locations]))
+    cube = per_country.to_numpy(dtype=float).reshape(len(years), len(locations), len(fields))
+    cube = np.round(cube.transpose(0, 2, 1), decimals)
+    names = df[label].astype(str).groupby(keys).first().reindex(locations)
+    return cube, locations, names.to_numpy()
+
+
+def hover_labels(dataframe, fields, label="Country", decimals=3):
+    """Return the hover text of every field for one year's rows.
+
+    Built with whole-column string concatenation: the country part is made
+    once per year and only the rounded values differ between fields.
+    """
+    prefix = "<b>Country: </b>" + dataframe[label].astype(str) + "<br> <b>Difference: </b>"
+    return pd.DataFrame(
+        {field: prefix + dataframe[field].round(decimals).astype(str) for field in fields},
+        index=dataframe.index,
+    )
+
+
+def year_slider(steps):
+    """Year slider layout shared by both layouts of the choropleth."""
+    return [
+        dict(active=0, currentvalue={"prefix": "Year: "}, font={"size": 12}, pad={"t": 50}, steps=steps)
+    ]
+
+
+def visibility_masks(n_fields, n_years):
+    """Boolean array where masks[y, f] makes only trace (year y, field f) visible.
+
+    Traces are added year by year and field by field within a year, so trace
+    (y, f) is trace number y * n_fields + f and the masks are the rows of an
+    identity matrix over all traces.
+    """
+    n_traces = n_years * n_fields
+    return np.eye(n_traces, dtype=bool).reshape(n_years, n_fields, n_traces)
+
+
+def full_controls(fields, years):
+    """Return (sliders, buttons) for the full layout with one trace per field and year.
+
+    There is one year slider per field whose steps show that field's trace
+    for the chosen year; picking a field in the dropdown shows its first year
+    and swaps in its slider. Works for any number of fields and years.
+    """
+    masks = visibility_masks(len(fields), len(years))
+    sliders = [
+        year_slider(
+            [
+                dict(method="update", args=[{"visible": masks[y, f].tolist()}], label=str(year))
+                for y, year in enumerate(years)
+            ]
+        )
+        for f in range(len(fields))
+    ]
+    buttons = [
+        dict(label=field, method="update", args=[{"visible": masks[0, f].tolist()}, {"sliders": sliders[f]}])
+        for f, field in enumerate(fields)
+    ]
+    return sliders, buttons
+
+
+def compact_controls(cube, fields, years):
+    """Return (sliders, buttons) that restyle z of the single compact trace.
+
+    There is one year slider per field; picking a field in the dropdown shows
+    its first year and swaps in that field's slider, as in the full layout.
+    """
+    sliders = [
+        year_slider(
+            [
+                dict(method="restyle", args=[{"z": [cube[y, f]]}], label=str(year))
+                for y, year in enumerate(years)
+            ]
+        )
+        for f in range(len(fields))
+    ]
+    buttons = [
+        dict(label=field, method="update", args=[{"z": [cube[0, f]]}, {"sliders": sliders[f]}])
+        for f, field in enumerate(fields)
+    ]
+    return sliders, buttons
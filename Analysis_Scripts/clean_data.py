@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Loader for the Clean_Datasets used by the analysis scripts
+
+Prefers the typed Feather copy written by Munging_Scripts/clean_store.py
+(categorical country/field/gender/subject columns, no CSV type inference,
+memory-mapped instead of parsed) and falls back to the CSV when the copy is missing, older than the CSV, or
+pyarrow is not installed.
+"""
+
+# importing necessary libraries
+import os
+
+import pandas as pd
+
+try:
+    from pyarrow import feather
+except ImportError:
+    feather = None
+
+
+def read_clean(csv_path):
+    """Read a clean dataset, from its Feather copy when that is up to date."""
+    feather_path = os.path.splitext(csv_path)[0] + ".feather"
+    if (
+        feather is not None
+        and os.path.exists(feather_path)
+        and (
+            not os.path.exists(csv_path)
+            or os.path.getmtime(feather_path) >= os.path.getmtime(csv_path)
+        )
+    ):
+        return feather.read_table(feather_path, memory_map=True).to_pandas()
+    return pd.read_csv(csv_path)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server-side aggregates for the fertility/labor dashboard
+(altair_fertility_participation.py --aggregate)
+
+Instead of embedding every row and letting Vega compute means and box
+statistics in the browser, each view gets a small table with only what it
+draws: one mean per country for the bar chart, five numbers (plus the
+outliers) per country for the boxplot and at most a fixed number of years
+per country for the scatter plot.
+"""
+
+# importing necessary libraries
+import numpy as np
+
+
+def country_means(df, value, group="Country"):
+    """Mean of `value` per country (what mean(value) computed in the browser)."""
+    return df.groupby(group, observed=True, as_index=False)[value].mean()
+
+
+def box_stats(df, value, group="Country", extent=1.5):
+    """Return (boxes, outliers) as drawn by a Vega-Lite boxplot.
+
+    boxes holds lower, q1, median, q3 and upper per country: quartiles with
+    linear interpolation and whiskers at the most extreme values within
+    `extent` interquartile ranges of the box. outliers holds the rows
+    outside the whiskers.
+    """
+    df = df.loc[df[value].notna(), [group, value]]
+    grouped = df.groupby(group, observed=True)[value]
+    boxes = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    boxes.columns = ["q1", "median", "q3"]
+
+    iqr = boxes["q3"] - boxes["q1"]
+    low = (boxes["q1"] - extent * iqr).reindex(df[group]).to_numpy()
+    high = (boxes["q3"] + extent * iqr).reindex(df[group]).to_numpy()
+    inside = ((df[value] >= low) & (df[value] <= high)).to_numpy()
+
+    whiskers = df[inside].groupby(group, observed=True)[value].agg(["min", "max"])
+    boxes["lower"] = whiskers["min"]
+    boxes["upper"] = whiskers["max"]
+    boxes = boxes[["lower", "q1", "median", "q3", "upper"]].reset_index()
+    return boxes, df[~inside].reset_index(drop=True)
+
+
+def decimate(df, max_points, group="Country", order="Year"):
+    """At most `max_points` rows per country, evenly spread over `order`.
+
+    Countries with fewer rows keep all of them; the first and last year of
+    every country are always kept.
+    """
+    df = df.sort_values([group, order], kind="stable")
+    position = df.groupby(group, observed=True).cumcount().to_numpy()
+    size = df.groupby(group, observed=True)[order].transform("size").to_numpy()
+    # keep the rows at round(k * step), k = 0 .. max_points - 1, i.e. the
+    # rounded positions of np.linspace(0, size - 1, max_points)
+    step = np.maximum((size - 1) / max(max_points - 1, 1), 1)
+    keep = np.round(np.round(position / step) * step) == position
+    return df[keep].reset_index(drop=True)
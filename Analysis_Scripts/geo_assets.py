@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Offline world geometry for the OECD choropleth (plotly_labor_entrance_novel.py)
+
+plotly.js draws geo maps from a topojson file it fetches from its CDN
+(https://cdn.plot.ly/world_50m.json for resolution=50) when the page opens,
+unless the page has already put one in window.PlotlyGeoAssets.topojson.
+oecd_topology cuts plotly's world topojson down to the charted countries
+and simplifies their borders (Douglas-Peucker on the shared arcs, so
+neighbours still meet); topojson_script turns it into the <script> that
+registers it, so the chart needs no network at all.
+
+The source file is plotly's own world_50m.json, downloaded once into
+Raw_Datasets/ (it is not part of the repository). check_topology verifies a
+reduced map (every charted country that has a shape is kept, every arc
+reference resolves, every ring is closed); plotly_labor_entrance_novel.py
+runs it on every map it embeds. Run this file directly to check
+oecd_topology on GEO_SAMPLE, a small extract of the Natural Earth 110m
+world-atlas topojson (as shipped in bqplot, ids changed to plotly's ISO3):
+    python Analysis_Scripts/geo_assets.py [topojson]
+"""
+
+# importing necessary libraries
+import json
+import sys
+
+import numpy as np
+
+## plotly's world topojson for resolution=50 and the CDN it comes from
+GEO_SOURCE = "Raw_Datasets/world_50m.json"
+GEO_SOURCE_URL = "https://cdn.plot.ly/world_50m.json"
+
+## Douglas-Peucker tolerance in degrees (0 keeps every point)
+GEO_TOLERANCE = 0.05
+
+## Real topojson extract (16 European countries) checked when this file runs
+GEO_SAMPLE = "Raw_Datasets/world_110m_europe_sample.json"
+
+## Objects plotly.js reads from the topojson: the countries are matched by
+## ISO3 id, land is filled and the line layers are drawn when enabled
+GEO_LAYERS = ["coastlines", "land", "ocean", "lakes", "rivers", "countries", "subunits"]
+
+
+def topojson_name(scope="world", resolution=50):
+    """Name plotly.js looks the topojson up by ("world_50m")."""
+    return f"{scope.replace(' ', '-')}_{resolution}m"
+
+
+def decode_arcs(topology):
+    """Arcs as arrays of absolute positions (still quantized when the topology is)."""
+    if "transform" in topology:
+        return [np.cumsum(np.asarray(arc, dtype=np.int64), axis=0) for arc in topology["arcs"]]
+    return [np.asarray(arc, dtype=float) for arc in topology["arcs"]]
+
+
+def encode_arcs(arcs, quantized):
+    """Inverse of decode_arcs (delta-encoded integers for a quantized topology)."""
+    if quantized:
+        return [np.diff(arc, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).tolist() for arc in arcs]
+    return [arc.tolist() for arc in arcs]
+
+
+def simplify_line(points, tolerance):
+    """Boolean mask of the points Douglas-Peucker keeps (both ends always kept)."""
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        segment = end - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distance = np.hypot(*(inner - start).T)
+        else:
+            distance = np.abs(segment[0] * (inner[:, 1] - start[1]) - segment[1] * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack += [(first, split), (split, last)]
+    return keep
+
+
+def polygon_rings(geom):
+    """Rings (lists of arc references) of a Polygon or MultiPolygon geometry."""
+    if geom.get("type") == "Polygon":
+        return geom["arcs"]
+    if geom.get("type") == "MultiPolygon":
+        return [ring for polygon in geom["arcs"] for ring in polygon]
+    return []
+
+
+def remap_arcs(arcs, index):
+    """Nested arc references with every arc i renumbered to index[i] (~i stays reversed)."""
+    if isinstance(arcs, int):
+        return index[arcs] if arcs >= 0 else ~index[~arcs]
+    return [remap_arcs(arc, index) for arc in arcs]
+
+
+def arc_ids(arcs):
+    """Every arc a nested arc reference list uses."""
+    if isinstance(arcs, int):
+        return {arcs if arcs >= 0 else ~arcs}
+    return set().union(*map(arc_ids, arcs)) if arcs else set()
+
+
+def oecd_topology(topology, ids, tolerance=GEO_TOLERANCE):
+    """plotly topojson reduced to the `ids` countries with borders simplified to `tolerance` degrees.
+
+    "countries" keeps the geometries whose id is in `ids`, "land" is the
+    same shapes (without ids) and the other layers plotly reads are empty.
+    Only the arcs of the kept countries are kept; arcs are simplified in
+    degrees and written back with the source quantization.
+    """
+    ids = set(ids)
+    countries = [geom for geom in topology["objects"]["countries"]["geometries"] if geom.get("id") in ids]
+    used = sorted(set().union(*(arc_ids(geom.get("arcs", [])) for geom in countries)))
+    index = {arc: i for i, arc in enumerate(used)}
+
+    arcs = decode_arcs(topology)
+    scale = np.asarray(topology.get("transform", {}).get("scale", [1, 1]), dtype=float)
+    keep = {arc: simplify_line(arcs[arc] * scale, tolerance) if tolerance > 0 else np.ones(len(arcs[arc]), dtype=bool)
+            for arc in used}
+    # a ring whose arcs all shrank to their ends (a small island, or a border
+    # and a coast closing on each other) would collapse to a line, so it keeps
+    # two inner points of each of its arcs (a ring needs four points)
+    for geom in countries:
+        for ring in polygon_rings(geom):
+            ring_arcs = [arc if arc >= 0 else ~arc for arc in ring]
+            if sum(keep[arc].sum() - 1 for arc in ring_arcs) < 3:
+                for arc in ring_arcs:
+                    keep[arc][[len(keep[arc]) // 3, 2 * len(keep[arc]) // 3]] = True
+    kept = [arcs[arc][keep[arc]] for arc in used]
+
+    countries = [dict(geom, arcs=remap_arcs(geom["arcs"], index)) if "arcs" in geom else geom for geom in countries]
+    land = [{key: value for key, value in geom.items() if key not in ("id", "properties")} for geom in countries]
+    objects = {layer: {"type": "GeometryCollection", "geometries": []} for layer in GEO_LAYERS}
+    objects["countries"]["geometries"] = countries
+    objects["land"]["geometries"] = land
+
+    reduced = {"type": "Topology", "objects": objects, "arcs": encode_arcs(kept, "transform" in topology)}
+    if "transform" in topology:
+        reduced["transform"] = topology["transform"]
+    return reduced
+
+
+def check_topology(reduced, source, ids):
+    """Problems of oecd_topology's `reduced` map of `source` for the `ids` countries (empty if none).
+
+    The kept country ids must be exactly the `ids` that have a shape in
+    `source`, every arc reference must resolve and every ring must be closed
+    (each arc starts where the previous one ended) with at least four points.
+    """
+    problems = []
+    mapped = {geom.get("id") for geom in source["objects"]["countries"]["geometries"] if "arcs" in geom}
+    kept = [geom.get("id") for geom in reduced["objects"]["countries"]["geometries"]]
+    if sorted(kept) != sorted(mapped & set(ids)):
+        problems.append(f"kept countries {sorted(kept)}, expected {sorted(mapped & set(ids))}")
+
+    arcs = decode_arcs(reduced)
+    for layer in ("countries", "land"):
+        for geom in reduced["objects"][layer]["geometries"]:
+            name = f"{layer} {geom['id']}" if "id" in geom else layer
+            unknown = sorted(arc for arc in arc_ids(geom.get("arcs", [])) if arc >= len(arcs))
+            if unknown:
+                problems.append(f"{name} uses missing arcs {unknown}")
+                continue
+            for ring in polygon_rings(geom):
+                points = [arcs[arc] if arc >= 0 else arcs[~arc][::-1] for arc in ring]
+                joins = [(points[i - 1][-1] == points[i][0]).all() for i in range(len(points))]
+                if not all(joins) or sum(len(part) - 1 for part in points) < 3:
+                    problems.append(f"{name} has an open or degenerate ring")
+    return problems
+
+
+def topojson_script(topology, name=topojson_name()):
+    """JavaScript registering `topology` as plotly's `name` topojson (run before the plot)."""
+    return (
+        "window.PlotlyGeoAssets = window.PlotlyGeoAssets || {};\n"
+        "window.PlotlyGeoAssets.topojson = window.PlotlyGeoAssets.topojson || {};\n"
+        f"window.PlotlyGeoAssets.topojson[{json.dumps(name)}] = "
+        f"{json.dumps(topology, separators=(',', ':'))};"
+    )
+
+
+if __name__ == "__main__":
+    # check oecd_topology on a real topojson for the charted countries, with
+    # and without simplification
+    source_path = sys.argv[1] if len(sys.argv) > 1 else GEO_SAMPLE
+    with open(source_path) as f:
+        source = json.load(f)
+    with open("Clean_Datasets/OECD_LaborForce_Data.csv") as f:
+        charted = {line.split(",", 1)[0] for line in f.readlines()[1:]}
+    failed = False
+    for tolerance in (0, GEO_TOLERANCE, 1):
+        problems = check_topology(oecd_topology(source, charted, tolerance), source, charted)
+        print(f"tolerance {tolerance}: " + ("; ".join(problems) if problems else "ok"))
+        failed = failed or bool(problems)
+    sys.exit(1 if failed else 0)
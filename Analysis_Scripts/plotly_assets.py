@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared plotly.js asset for the Plotly charts (plotly_tech_skills.py,
+plotly_labor_entrance_novel.py)
+
+By default write_html inlines the whole plotly.js bundle (about 4.5 MB) into
+every chart. With shared_js=True the bundle is written once next to the
+charts as plotly-<version>.min.js and every chart loads it with a relative
+<script src>, so the pages still work offline and browsers download the
+bundle once for all of them. The version in the file name keeps charts
+written with an older plotly on the bundle they were made with. Pages and
+bundle have to be served from the same directory (run_pipeline.py moves the
+bundle into Final_Viz/ along with the pages).
+"""
+
+# importing necessary libraries
+import os
+import sys
+import webbrowser
+
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+## Atomic writes are shared with the munging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from atomic_file import atomic_write
+
+## File name of the shared bundle of the installed plotly
+PLOTLYJS = f"plotly-{get_plotlyjs_version()}.min.js"
+
+
+def write_plotlyjs(directory="."):
+    """Write PLOTLYJS into `directory` unless it is already there; return its path."""
+    path = os.path.join(directory, PLOTLYJS)
+    if not os.path.exists(path):
+        # a chart opened meanwhile never loads half a bundle
+        with atomic_write(path, encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    return path
+
+
+def write_chart(fig, html_path, shared_js=False, auto_open=False, head_script=None):
+    """fig.write_html, loading plotly.js from the shared PLOTLYJS file when shared_js is set.
+
+    head_script is JavaScript run before plotly.js and the plot (e.g. the
+    offline topojson from geo_assets.topojson_script).
+    """
+    include_plotlyjs = True
+    if shared_js:
+        write_plotlyjs(os.path.dirname(html_path) or ".")
+        include_plotlyjs = PLOTLYJS
+    if head_script is None:
+        fig.write_html(html_path, include_plotlyjs=include_plotlyjs, auto_open=auto_open)
+        return
+    html = fig.to_html(include_plotlyjs=include_plotlyjs)
+    html = html.replace("<head>", f'<head><script type="text/javascript">{head_script}</script>', 1)
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    if auto_open:
+        webbrowser.open("file://" + os.path.realpath(html_path))
@@ -9,29 +9,24 @@ Created on Thu Apr 21 12:44:03 2022
 ## Code was then generalized with for loops 
 
 # Load necessary packages
+import json
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from plotly.offline import plot
-
-
-# Load data
-df = pd.read_csv("Clean_Datasets/OECD_LaborForce_Data.csv")
-
-# Filter out year = 2005 to focus on annual measurements 2010 - 2019
-df = df[df['Year'] != 2005] 
-
-# Create list of dataframes by year
-years = df.Year.unique().tolist()
-years.sort()
-dataframes = []
-
-for year in years:
-    df_year = df[df["Year"] == year]
-    dataframes.append(df_year)
+import sys
+from choropleth_controls import compact_controls, full_controls, hover_labels, value_cube
+from clean_data import read_clean
+from geo_assets import (GEO_SOURCE, GEO_SOURCE_URL, GEO_TOLERANCE, check_topology, oecd_topology, topojson_name,
+                        topojson_script)
+from plotly_assets import write_chart
+
+# build_choropleth can be imported (nothing runs on import); running the file
+# writes OECD_Novel_Viz.html (--open also opens it in the browser, --shared-js
+# loads plotly.js from a shared file next to it, see plotly_assets.py).
+# With --offline-geo [--geo-tolerance DEGREES] the page carries its own
+# simplified map of the charted countries instead of fetching plotly's world
+# map from the CDN (see geo_assets.py)
 
 # Define all the columns that will be included in the dropdown menu
-dropdown_columns = [
+DROPDOWN_COLUMNS = [
     "Agriculture, forestry, fisheries and veterinary",
     "Engineering, manufacturing and construction",
     "Health and welfare",
@@ -45,347 +40,185 @@ dropdown_columns = [
     "Social sciences, journalism and information",
 ]
 
-# Initialize Graph Object
-fig = go.Figure()
-# Make base map white: https://plotly.com/python/map-configuration/
-fig.update_geos(
-    resolution=50,
-    showland=True, landcolor="White"
-)
+# Resolution of the base map (plotly's world_50m topojson)
+GEO_RESOLUTION = 50
+
+# Define colorscale to match theme of dashboard
+COLORSCALE = ["#FF69B4", "#f49cc8", "#d9d2e9", "#8cbae0", "#4682B4"]
+
+
+def build_choropleth(df, compact=False):
+    """Choropleth of the difference in men and women entering each field, by year.
 
-# Define traces for all possible cases
-# 11 fields x 11 years = 121 traces
-# i.e. Trace  0 --> Agriculture in 2005
+    df is the OECD_LaborForce_Data layout. With compact=True the data is
+    shipped only once: a single trace whose z is restyled by the dropdown and
+    slider, instead of 121 traces with their own locations, values and hover text.
+    """
+    # Filter out year = 2005 to focus on annual measurements 2010 - 2019
+    df = df[df['Year'] != 2005]
 
-for dataframe in dataframes:
-    for field in dropdown_columns:
+    # Create list of dataframes by year
+    years = df.Year.unique().tolist()
+    years.sort()
+    dataframes = []
+
+    for year in years:
+        df_year = df[df["Year"] == year]
+        dataframes.append(df_year)
+
+    # Any other ISCED field in the data goes after the known ones
+    dropdown_columns = DROPDOWN_COLUMNS + [
+        col for col in df.columns if col not in DROPDOWN_COLUMNS + ["COUNTRY", "Country", "Year", "STEM_Status"]
+    ]
+
+    # Initialize Graph Object
+    fig = go.Figure()
+    # Make base map white: https://plotly.com/python/map-configuration/
+    fig.update_geos(
+        resolution=GEO_RESOLUTION,
+        showland=True, landcolor="White"
+    )
+
+    if compact:
+        # One trace for every field and year: locations and country names are
+        # shipped once, the controls restyle z from the year x field x country matrix
+        cube, locations, names = value_cube(df, years, dropdown_columns)
         fig.add_trace(
             go.Choropleth(
-                uid="set2",  # What is set2??
-                locations=dataframe["COUNTRY"],  # Country Code
-                z=dataframe[field],  # Data to be color-coded
-                colorbar_title=field,
+                locations=locations,  # Country Code
+                z=cube[0, 0],  # Agriculture in the first year
+                text=names,
                 coloraxis="coloraxis",
-                visible=False,
                 zmax=45,
                 zmin=(-45),
-                text=dataframe.apply(
-                    lambda row: f"<b>Country: </b>{row['Country']}<br> <b>Difference: </b>{round(row[field], 3)}",
-                    axis=1,
-                ),
-                hoverinfo="text",
+                hovertemplate="<b>Country: </b>%{text}<br> <b>Difference: </b>%{z:.3~f}<extra></extra>",
             )
         )
-
-# Make first trace visible
-
-fig.data[0].visible = True
-
-
-# DEFINE ONE SLIDE FOR EACH BUTTON
-sliders = []
-for item in dropdown_columns:
-    steps = []
-    for i, year in enumerate(years):
-        step = dict(
-            method="update",
-            args=[
-                {"visible": [False] * len(years)},
-                # {"title": item + " in " + str(year)}
-            ],  # layout attribute
-            label=str(year),
-        )
-        step["args"][0]["visible"][i] = True  # Toggle i'th trace to "visible"
-        steps.append(step)
-    slider1 = [
-        dict(active=0, currentvalue={"prefix": "Year: "}, font = {"size":12}, pad={"t": 50}, steps=steps) # Add "Year" text to slider
-    ]
-    sliders.append(slider1)
-
-# Initialize slider for Agriculture
-fig.update_layout(sliders=sliders[0])
+        sliders, buttons = compact_controls(cube, dropdown_columns, years)
+
+        # Initialize slider for Agriculture
+        fig.update_layout(sliders=sliders[0])
+    else:
+        # Define traces for all possible cases
+        # 11 fields x 11 years = 121 traces, year by year
+        # i.e. Trace  0 --> Agriculture in the first year, trace 11 --> Agriculture in the second
+
+        for dataframe in dataframes:
+            # Hover text for all fields of this year, built column-wise
+            labels = hover_labels(dataframe, dropdown_columns)
+            for field in dropdown_columns:
+                fig.add_trace(
+                    go.Choropleth(
+                        uid="set2",  # What is set2??
+                        locations=dataframe["COUNTRY"],  # Country Code
+                        z=dataframe[field],  # Data to be color-coded
+                        colorbar_title=field,
+                        coloraxis="coloraxis",
+                        visible=False,
+                        zmax=45,
+                        zmin=(-45),
+                        text=labels[field],
+                        hoverinfo="text",
+                    )
+                )
+
+        # Make first trace visible
+
+        fig.data[0].visible = True
+
+
+        # DEFINE ONE SLIDER FOR EACH BUTTON
+        # Visibility masks are generated over the (year, field) trace grid
+        sliders, buttons = full_controls(dropdown_columns, years)
+
+        # Initialize slider for Agriculture
+        fig.update_layout(sliders=sliders[0])
+
+
+    # ADD DROPDOWN TO CHANGE TYPE
+    fig.update_layout(
+        coloraxis_colorscale=COLORSCALE,
+        title="Difference in Share of Men and Women Entering Different Professional Fields <br><sup><i>Data Source: OECD Statistics 2018 (https://stats.oecd.org/Index.aspx?QueryId=109881)</i></sup>",
+        title_x=0.1,
+        # Dropdown menu with one button per field
+        updatemenus=[
+            dict(
+                buttons=buttons,
+                direction="down",
+                showactive=True,
+                pad={"r": 10, "t": 10},
+                x=0.9,
+                xanchor="left",
+                y=1.2,
+                yanchor="top",
+            ),
+        ],
+    )
 
 
-# ADD DROPDOWN TO CHANGE TYPE
-# Define colorscale to match theme of dashboard
-colorscale = ["#FF69B4", "#f49cc8", "#d9d2e9", "#8cbae0", "#4682B4"]
-
-fig.update_layout(
-    coloraxis_colorscale=colorscale,
-    title="Difference in Share of Men and Women Entering Different Professional Fields <br><sup><i>Data Source: OECD Statistics 2018 (https://stats.oecd.org/Index.aspx?QueryId=109881)</i></sup>",
-    title_x=0.1,
-    # Create individual dictionaries for each dropdown menu item
-    updatemenus=[
-        dict(
-            buttons=list(
-                [
-                    dict(
-                        label="Agriculture, forestry, fisheries and veterinary",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[0]},
-                        ],
-                    ),
-                    dict(
-                        label="Engineering, manufacturing and construction",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[1]},
-                        ],
-                    ),
-                    dict(
-                        label="Health and welfare",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[2]},
-                        ],
-                    ),
-                    dict(
-                        label="Information and Communication Technologies (ICTs)",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[3]},
-                        ],
-                    ),
-                    dict(
-                        label="Natural sciences, mathematics and statistics",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[4]},
-                        ],
-                    ),
-                    dict(
-                        label="Arts and humanities",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[5]},
-                        ],
-                    ),
-                    dict(
-                        label="Business, administration and law",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[6]},
-                        ],
-                    ),
-                    dict(
-                        label="Education",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[7]},
-                        ],
-                    ),
-                    dict(
-                        label="Generic programmes and qualifications",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[8]},
-                        ],
-                    ),
-                    dict(
-                        label="Services",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                    False,
-                                ]
-                            },
-                            {"sliders": sliders[9]},
-                        ],
-                    ),
-                    dict(
-                        label="Social sciences, journalism and information",
-                        method="update",
-                        args=[
-                            {
-                                "visible": [
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    False,
-                                    True,
-                                ]
-                            },
-                            {"sliders": sliders[10]},
-                        ],
-                    ),
-                ]
-            ),
-            direction="down",
-            showactive=True,
-            pad={"r": 10, "t": 10},
-            x=0.9,
-            xanchor="left",
-            y=1.2,
-            yanchor="top",
+    # Add legend title
+    fig.update_layout(
+        coloraxis_colorbar=dict(
+            title="<b>% Men Minus % Women Entering</b>",
+            title_font_color = '#444444',
+            title_font_size = 12
         ),
-    ],
-)
-
-
-# Add legend title
-fig.update_layout(
-    coloraxis_colorbar=dict(
-        title="<b>% Men Minus % Women Entering</b>",
-        title_font_color = '#444444',
-        title_font_size = 12
-    ),
-    hoverlabel = dict(
-        font_size = 14),
-    title_font = dict(size = 23)
-)
-
-fig.update_coloraxes(cmid=0)
-fig.write_html("OECD_Novel_Viz.html", auto_open=True)
+        hoverlabel = dict(
+            font_size = 14),
+        title_font = dict(size = 23)
+    )
+
+    fig.update_coloraxes(cmid=0)
+    return fig
+
+
+def parse_geo_tolerance(argv):
+    """DEGREES of a --geo-tolerance DEGREES argument (GEO_TOLERANCE without one).
+
+    Raises ValueError for a --geo-tolerance without a number of degrees (0 or more) after it.
+    """
+    if "--geo-tolerance" not in argv:
+        return GEO_TOLERANCE
+    position = argv.index("--geo-tolerance")
+    try:
+        tolerance = float(argv[position + 1]) if position + 1 < len(argv) else -1
+    except ValueError:
+        tolerance = -1
+    if not tolerance >= 0:
+        raise ValueError(f"usage: --geo-tolerance DEGREES (0 or more, default {GEO_TOLERANCE})")
+    return tolerance
+
+
+def offline_geo_script(df, source=GEO_SOURCE, tolerance=GEO_TOLERANCE):
+    """Script registering the map of df's countries, simplified to `tolerance` degrees.
+
+    Raises ValueError if the reduced map fails geo_assets.check_topology.
+    """
+    with open(source) as f:
+        world = json.load(f)
+    countries = df["COUNTRY"].astype(str).unique()
+    topology = oecd_topology(world, countries, tolerance)
+    problems = check_topology(topology, world, countries)
+    if problems:
+        raise ValueError(f"the map reduced from {source} is broken: " + "; ".join(problems))
+    return topojson_script(topology, topojson_name(resolution=GEO_RESOLUTION))
+
+
+if __name__ == "__main__":
+    # Load data
+    df = read_clean("Clean_Datasets/OECD_LaborForce_Data.csv")
+    fig = build_choropleth(df, compact="--compact" in sys.argv)
+
+    head_script = None
+    if "--offline-geo" in sys.argv:
+        try:
+            head_script = offline_geo_script(df, tolerance=parse_geo_tolerance(sys.argv))
+        except FileNotFoundError:
+            sys.exit(f"--offline-geo needs {GEO_SOURCE} (download it once from {GEO_SOURCE_URL})")
+        except ValueError as err:
+            sys.exit(str(err))
+
+    write_chart(
+        fig, "OECD_Novel_Viz.html", shared_js="--shared-js" in sys.argv,
+        auto_open="--open" in sys.argv, head_script=head_script,
+    )
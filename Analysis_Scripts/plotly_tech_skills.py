@@ -7,79 +7,134 @@ Created on Sun Mar 27 22:39:26 2022
 """
 
 # final project: kaggle viz
+# build_skills_chart can be imported (nothing runs on import); running the
+# file writes kaggle_prog_skills.html (--open also opens it in the browser,
+# --shared-js loads plotly.js from a shared file next to it, see plotly_assets.py)
+# With --slice DIMENSION=ANSWER (repeatable, ANSWER|ANSWER for several) the
+# chart is drawn from the demographics cube instead (see kaggle_cube.py) for
+# just the selected respondents and written to kaggle_prog_skills_slice.html, e.g.
+#   --slice "professional_title=Data Scientist" --slice country=India --slice "experience_years=0-1|1-2"
 
 # importing necessary libraries
-import pandas as pd
 import os
+import sys
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from plotly.offline import plot
-
-# checking the working directory
-path = os.getcwd()
-path
-
-kaggle = pd.read_csv("Clean_Datasets/Kaggle_WomenInDataScience_viz.csv")
-
-# now let's take a look at the data
-kaggle.head()
-kaggle.columns
-
-# dropping none and other
-kaggle = kaggle[(kaggle.programming_skill != "None") & (kaggle.programming_skill != "Other")]
-
-kaggle_m = kaggle[kaggle['gender'] == "Male"]
-kaggle_m = kaggle_m.sort_values(by=['ratio'], ascending=True)
-
-kaggle_f = kaggle[kaggle['gender'] == "Female"]
-kaggle_f = kaggle_f.sort_values(by=['ratio'], ascending=True)
-
-kaggle_m = kaggle_m.set_index("programming_skill")
-kaggle_f = kaggle_f.set_index("programming_skill")
-
-kaggle_m['ratio'] *= -1 # making male ratio negative
-
-# creating bidirectional bar chart to show skills of mean and women
-
-# plotly
-# resource used: https://towardsai.net/p/l/tips-and-tricks-for-plotly-bar-chart, 
-# resource used: https://community.plotly.com/t/subplots-how-to-add-master-axis-titles/13927/12
-# resource used: https://stackoverflow.com/questions/68405808/dash-plotly-transform-into-an-absolute-value-for-hovertemplate
-fig = make_subplots(rows=1, cols=2, specs=[[{}, {}]], shared_xaxes=True,
-                    shared_yaxes=True, horizontal_spacing=0,
-                    x_title='Percentage Of Respondents Of Each Gender Using On A Regular Basis',
-                    y_title='Programming Tool',
-                    subplot_titles=('Males',  'Females'))
-
-fig.append_trace(go.Bar(y=kaggle_m.index, x=kaggle_m.ratio, orientation='h', width=0.4, 
-                                 showlegend=False, marker_color='#4682B4', name="Males", meta=abs(kaggle_m.ratio),
-                                 hovertemplate='%{meta:-.2%}'+'<br>Tool: %{y}'), 1, 1)
-
-fig.append_trace(go.Bar(y=kaggle_f.index, x=kaggle_f.ratio, orientation='h', width=0.4, 
-                                 showlegend=False, marker_color='#FF69B4', name="Females",
-                                 hovertemplate='%{x:.2%}'+'<br>Tool: %{y}'), 1, 2)
-
-fig.update_layout(title='Data Analytics Technical Skills By Gender',
-                  title_font=dict(size=25, color='black', family="Open Sans"),
-                  xaxis_range=[-0.33,0],
-                  yaxis = dict(tickfont = dict(size=12)),
-                  xaxis1 = dict(
-                    tickmode = 'array',
-                    tickvals = [-0.25, -0.2, -0.15, -0.1, -0.05],
-                    ticktext = ['25%', '20%', '15%', '10%', '5%']),
-                  xaxis2 = dict(
-                    tickmode = 'array',
-                    tickvals = [0, 0.05, 0.1, 0.15, 0.2, 0.25],
-                    ticktext = ['0%', '5%', '10%', '15%', '20%', '25%']),
-                  hoverlabel=dict(bgcolor="white", font_size=14, 
-                                  font_family="Open Sans"))
-fig.update_yaxes(ticklabelposition="inside")
-fig.update_layout(plot_bgcolor = "white")
-fig.update_xaxes(showline=True, linewidth=2, linecolor='grey', gridcolor='#C6C6C6')
-
-plot(fig)
-
-fig.write_html("kaggle_prog_skills.html")
-
-
-
+from clean_data import read_clean
+from plotly_assets import write_chart
+
+## The demographics cube is written by the Kaggle munging
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from kaggle_cube import CUBE_OUTPUT, cube_skill_shares, load_cube
+
+TITLE = 'Data Analytics Technical Skills By Gender'
+
+
+def parse_slices(argv):
+    """{dimension: [answers]} of the --slice DIMENSION=ANSWER[|ANSWER...] arguments.
+
+    Raises ValueError for a --slice without a DIMENSION=ANSWER after it.
+    """
+    selection = {}
+    for position, arg in enumerate(argv):
+        if arg == "--slice":
+            value = argv[position + 1] if position + 1 < len(argv) else ""
+            dimension, _, answers = value.partition("=")
+            if not dimension or not answers:
+                raise ValueError("usage: --slice DIMENSION=ANSWER[|ANSWER...], e.g. --slice country=India")
+            selection[dimension] = answers.split("|")
+    return selection
+
+
+def slice_title(selection):
+    """TITLE with the selected answers as a subtitle."""
+    chosen = ", ".join(f"{dimension}: {' / '.join(answers)}" for dimension, answers in selection.items())
+    return f"{TITLE}<br><sup>{chosen}</sup>"
+
+
+def build_skills_chart(kaggle, title=TITLE):
+    """Bidirectional bar chart of the share of men and women using each programming tool."""
+    # dropping none and other
+    kaggle = kaggle[(kaggle.programming_skill != "None") & (kaggle.programming_skill != "Other")]
+
+    kaggle_m = kaggle[kaggle['gender'] == "Male"]
+    kaggle_m = kaggle_m.sort_values(by=['ratio'], ascending=True)
+
+    kaggle_f = kaggle[kaggle['gender'] == "Female"]
+    kaggle_f = kaggle_f.sort_values(by=['ratio'], ascending=True)
+
+    kaggle_m = kaggle_m.set_index("programming_skill")
+    kaggle_f = kaggle_f.set_index("programming_skill")
+
+    kaggle_m = kaggle_m.assign(ratio=-kaggle_m['ratio']) # making male ratio negative
+
+    # 95% bootstrap intervals as error bars when the data has them (the male
+    # bars point left, so their upper bound is the minus side)
+    error_m = error_f = None
+    if "ratio_low" in kaggle:
+        error_m = dict(type='data', array=-kaggle_m.ratio - kaggle_m.ratio_low, arrayminus=kaggle_m.ratio_high + kaggle_m.ratio,
+                       color='grey', thickness=1, width=2)
+        error_f = dict(type='data', array=kaggle_f.ratio_high - kaggle_f.ratio, arrayminus=kaggle_f.ratio - kaggle_f.ratio_low,
+                       color='grey', thickness=1, width=2)
+
+    # creating bidirectional bar chart to show skills of mean and women
+
+    # plotly
+    # resource used: https://towardsai.net/p/l/tips-and-tricks-for-plotly-bar-chart,
+    # resource used: https://community.plotly.com/t/subplots-how-to-add-master-axis-titles/13927/12
+    # resource used: https://stackoverflow.com/questions/68405808/dash-plotly-transform-into-an-absolute-value-for-hovertemplate
+    fig = make_subplots(rows=1, cols=2, specs=[[{}, {}]], shared_xaxes=True,
+                        shared_yaxes=True, horizontal_spacing=0,
+                        x_title='Percentage Of Respondents Of Each Gender Using On A Regular Basis',
+                        y_title='Programming Tool',
+                        subplot_titles=('Males',  'Females'))
+
+    fig.append_trace(go.Bar(y=kaggle_m.index, x=kaggle_m.ratio, orientation='h', width=0.4,
+                                     showlegend=False, marker_color='#4682B4', name="Males", meta=abs(kaggle_m.ratio), error_x=error_m,
+                                     hovertemplate='%{meta:-.2%}'+'<br>Tool: %{y}'), 1, 1)
+
+    fig.append_trace(go.Bar(y=kaggle_f.index, x=kaggle_f.ratio, orientation='h', width=0.4,
+                                     showlegend=False, marker_color='#FF69B4', name="Females", error_x=error_f,
+                                     hovertemplate='%{x:.2%}'+'<br>Tool: %{y}'), 1, 2)
+
+    fig.update_layout(title=title,
+                      title_font=dict(size=25, color='black', family="Open Sans"),
+                      xaxis_range=[-0.33,0],
+                      yaxis = dict(tickfont = dict(size=12)),
+                      xaxis1 = dict(
+                        tickmode = 'array',
+                        tickvals = [-0.25, -0.2, -0.15, -0.1, -0.05],
+                        ticktext = ['25%', '20%', '15%', '10%', '5%']),
+                      xaxis2 = dict(
+                        tickmode = 'array',
+                        tickvals = [0, 0.05, 0.1, 0.15, 0.2, 0.25],
+                        ticktext = ['0%', '5%', '10%', '15%', '20%', '25%']),
+                      hoverlabel=dict(bgcolor="white", font_size=14,
+                                      font_family="Open Sans"))
+    fig.update_yaxes(ticklabelposition="inside")
+    fig.update_layout(plot_bgcolor = "white")
+    fig.update_xaxes(showline=True, linewidth=2, linecolor='grey', gridcolor='#C6C6C6')
+    return fig
+
+
+if __name__ == "__main__":
+    try:
+        selection = parse_slices(sys.argv)
+    except ValueError as err:
+        sys.exit(str(err))
+    if selection:
+        try:
+            cube = load_cube(CUBE_OUTPUT)
+        except FileNotFoundError:
+            sys.exit(f"--slice needs {CUBE_OUTPUT} (run Munging_Scripts/kaggle-data-munging.py first)")
+        try:
+            kaggle = cube_skill_shares(cube, **selection)
+        except ValueError as err:
+            sys.exit(str(err))
+        fig = build_skills_chart(kaggle, title=slice_title(selection))
+        html_path = "kaggle_prog_skills_slice.html"
+    else:
+        kaggle = read_clean("Clean_Datasets/Kaggle_WomenInDataScience_viz.csv")
+        fig = build_skills_chart(kaggle)
+        html_path = "kaggle_prog_skills.html"
+    write_chart(fig, html_path, shared_js="--shared-js" in sys.argv, auto_open="--open" in sys.argv)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: hover text of the OECD choropleth
+
+Compares the old row-wise apply (one call per field and year) with
+choropleth_controls.hover_labels (one column-wise build per year) on
+Clean_Datasets/OECD_LaborForce_Data.csv and on copies scaled 10x and 100x.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_choropleth_hover.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Analysis_Scripts"))
+from choropleth_controls import hover_labels
+
+SCALES = [1, 10, 100]
+
+
+def legacy_labels(dataframes, fields):
+    """The original per-trace apply from plotly_labor_entrance_novel.py."""
+    texts = []
+    for dataframe in dataframes:
+        for field in fields:
+            texts.append(
+                dataframe.apply(
+                    lambda row: f"<b>Country: </b>{row['Country']}<br> <b>Difference: </b>{round(row[field], 3)}",
+                    axis=1,
+                )
+            )
+    return texts
+
+
+def vectorized_labels(dataframes, fields):
+    texts = []
+    for dataframe in dataframes:
+        labels = hover_labels(dataframe, fields)
+        texts.extend(labels[field] for field in fields)
+    return texts
+
+
+def scaled(df, factor):
+    """Repeat every country `factor` times under new codes."""
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        copy["COUNTRY"] = copy["COUNTRY"] + str(i)
+        copy["Country"] = copy["Country"] + f" {i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    df = pd.read_csv("Clean_Datasets/OECD_LaborForce_Data.csv")
+    df = df[df["Year"] != 2005]
+    fields = [col for col in df.columns if col not in ("COUNTRY", "Country", "Year", "STEM_Status")]
+
+    print(f"{'scale':>6} {'rows':>8} {'apply (s)':>10} {'vectorized (s)':>15} {'speedup':>8}")
+    for factor in SCALES:
+        data = scaled(df, factor)
+        dataframes = [data[data["Year"] == year] for year in sorted(data["Year"].unique())]
+        legacy, legacy_time = timed(legacy_labels, dataframes, fields)
+        vectorized, vectorized_time = timed(vectorized_labels, dataframes, fields)
+        assert all(a.tolist() == b.tolist() for a, b in zip(legacy, vectorized))
+        print(f"{factor:>5}x {len(data):>8,} {legacy_time:>10.3f} {vectorized_time:>15.3f} "
+              f"{legacy_time / vectorized_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
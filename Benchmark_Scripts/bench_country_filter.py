@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: OECD country filter of the fertility dashboard
+
+Compares the old alternation regex (str.contains over every row) with
+country_index.iso3_codes + is_member (one lookup per distinct name, then an
+isin over the codes) on the raw OWID file
+Raw_Datasets/fertility-and-female-labor-force-participation.csv and on
+copies scaled 10x and 100x. Also lists the countries on which the two
+filters disagree.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_country_filter.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from country_index import is_member, iso3_codes
+
+SCALES = [1, 10, 100]
+
+## The pattern from the original altair_fertility_participation.py
+OECD_PATTERN = "Australia|Austria|Belgium|Canada|Chile|Colombia|Costa Rica|Czech Republic|Denmark|Estonia|Finland|France|Germany|Greece|Hungary|Iceland|Ireland|Isreal|Italy|Japan|Korea|Latvia|Lithuania|Luxembourg|Mexico|Netherlands|New Zealand|Norway|Poland|Portugal|Slovak Republic|Slovenia|Spain|Sweden|Switzerland|Turkey|United Kingdom|United States"
+
+
+def regex_filter(countries):
+    return (countries.str.contains(OECD_PATTERN) == True).to_numpy()
+
+
+def index_filter(countries):
+    return is_member(iso3_codes(countries))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    countries = pd.read_csv(
+        "Raw_Datasets/fertility-and-female-labor-force-participation.csv", usecols=["Entity"]
+    )["Entity"]
+
+    regex, index = regex_filter(countries), index_filter(countries)
+    print("only matched by the regex:", sorted(countries[regex & ~index].unique()))
+    print("only matched by the index:", sorted(countries[index & ~regex].unique()))
+    print()
+
+    print(f"{'scale':>6} {'rows':>10} {'regex (s)':>10} {'index (s)':>10} {'speedup':>8}")
+    for factor in SCALES:
+        data = pd.concat([countries] * factor, ignore_index=True)
+        _, regex_time = timed(regex_filter, data)
+        _, index_time = timed(index_filter, data)
+        print(f"{factor:>5}x {len(data):>10,} {regex_time:>10.3f} {index_time:>10.3f} "
+              f"{regex_time / index_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: bootstrap intervals of the Kaggle skill shares
+
+On synthetic surveys of 1, 10 and 30x the 2018 survey (see bench_stages.py)
+times kaggle_bootstrap.share_intervals (skill combinations + batched
+multinomial draws, REPLICATES replicates per gender), in one process and in
+a pool of one process per CPU (the same as one process on a single CPU),
+next to a plain bootstrap that draws respondent indices and sums their skill
+rows. The plain one is timed on NAIVE_REPLICATES replicates and scaled up to
+REPLICATES.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_kaggle_bootstrap.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from kaggle_bootstrap import GENDERS, LEVEL, REPLICATES, share_intervals, skill_patterns
+from kaggle_survey import skill_columns, skill_matrix
+from bench_kaggle_matrix import best_of, survey_frame
+from bench_stages import KAGGLE_RESPONDENTS
+
+SCALES = [1, 10, 30]
+NAIVE_REPLICATES = 50
+
+## Processes of the pooled run
+JOBS = os.cpu_count() or 1
+
+## Replicates the plain bootstrap sums at once
+NAIVE_BATCH = 10
+
+
+def naive_shares(matrix, gender, replicates, seed=0):
+    """Skill shares of `replicates` resamples drawn as respondent indices."""
+    rng = np.random.default_rng(seed)
+    used = matrix.loc[matrix["gender"] == gender, skill_columns(matrix)].to_numpy()
+    shares = []
+    for start in range(0, replicates, NAIVE_BATCH):
+        rows = rng.integers(0, len(used), size=(min(NAIVE_BATCH, replicates - start), len(used)))
+        counts = used[rows].sum(axis=1)
+        shares.append(counts / counts.sum(axis=1, keepdims=True))
+    return np.concatenate(shares)
+
+
+def naive_intervals(matrix, replicates):
+    quantiles = [(1 - LEVEL) / 2, (1 + LEVEL) / 2]
+    return {gender: np.quantile(naive_shares(matrix, gender, replicates), quantiles, axis=0) for gender in GENDERS}
+
+
+def main():
+    print(f"{'scale':>6} {'respondents':>12} {'combinations':>13} {'bootstrap (s)':>14} "
+          f"{f'{JOBS} jobs (s)':>11} {'plain (s, est.)':>16}")
+    for scale in SCALES:
+        respondents = KAGGLE_RESPONDENTS * scale
+        matrix = skill_matrix(survey_frame(respondents))
+        combinations = len(skill_patterns(matrix))
+        batched = best_of(share_intervals, matrix, repeat=1)
+        pooled = best_of(lambda: share_intervals(matrix, jobs=JOBS), repeat=1)
+        start = time.perf_counter()
+        naive_intervals(matrix, NAIVE_REPLICATES)
+        naive = (time.perf_counter() - start) * REPLICATES / NAIVE_REPLICATES
+
+        if scale == 1:
+            # sanity check: both bootstraps give about the same intervals
+            shares, _ = share_intervals(matrix)
+            for gender, (low, high) in naive_intervals(matrix, REPLICATES).items():
+                chosen = shares[shares["gender"] == gender]
+                assert np.allclose(chosen["ratio_low"], low, atol=2e-3)
+                assert np.allclose(chosen["ratio_high"], high, atol=2e-3)
+
+        print(f"{scale:>6} {respondents:>12,} {combinations:>13,} {batched:>14.3f} "
+              f"{pooled:>11.3f} {naive:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: slicing the Kaggle demographics cube vs filtering the skill matrix
+
+On synthetic surveys of 1, 10 and 30x the 2018 survey (see bench_stages.py)
+times building the kaggle_cube count cube from the skill matrix, then the
+per-gender skill counts of one slice (data scientists in India with 0-2
+years' experience) and the full roll-up, taken from the cube and by
+filtering the respondent x skill matrix. The cube's cost does not grow with
+the survey.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_kaggle_cube.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from kaggle_cube import build_cube, cube_counts
+from kaggle_survey import skill_counts, skill_matrix
+from bench_kaggle_matrix import best_of, survey_frame
+from bench_stages import KAGGLE_RESPONDENTS
+
+SCALES = [1, 10, 30]
+
+## The slice of the example
+SELECTION = {"professional_title": "Data Scientist", "country": "India", "experience_years": ["0-1", "1-2"]}
+
+
+def matrix_slice(matrix):
+    chosen = pd.Series(True, index=matrix.index)
+    for dimension, answers in SELECTION.items():
+        chosen &= matrix[dimension].isin([answers] if isinstance(answers, str) else answers)
+    return skill_counts(matrix[chosen])
+
+
+def main():
+    print(f"{'scale':>6} {'respondents':>12} {'cube (MB)':>10} {'build (s)':>10} "
+          f"{'slice cube (s)':>15} {'slice matrix (s)':>17} {'total cube (s)':>15} {'total matrix (s)':>17}")
+    for scale in SCALES:
+        respondents = KAGGLE_RESPONDENTS * scale
+        matrix = skill_matrix(survey_frame(respondents))
+        build = best_of(build_cube, matrix)
+        cube = build_cube(matrix)
+        size = (cube["counts"].nbytes + cube["respondents"].nbytes) / 1e6
+
+        # sanity check: the cube gives the same counts as the filtered matrix
+        from_cube = cube_counts(cube, **SELECTION)
+        pd.testing.assert_frame_equal(from_cube.loc[from_cube.index != "(no answer)"], matrix_slice(matrix),
+                                      check_categorical=False, check_index_type=False)
+
+        cube_slice = best_of(lambda: cube_counts(cube, **SELECTION))
+        filtered = best_of(matrix_slice, matrix)
+        cube_total = best_of(cube_counts, cube)
+        matrix_total = best_of(skill_counts, matrix)
+        print(f"{scale:>6} {respondents:>12,} {size:>10.1f} {build:>10.4f} "
+              f"{cube_slice:>15.5f} {filtered:>17.5f} {cube_total:>15.5f} {matrix_total:>17.5f}")
+
+
+if __name__ == "__main__":
+    main()
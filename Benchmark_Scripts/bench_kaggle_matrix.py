@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: melted frame vs respondent x skill matrix for the Kaggle Q16 answers
+
+On synthetic surveys of 1, 10 and 30x the 2018 survey (see bench_stages.py)
+compares, for the old melt + groupby path and kaggle_survey.skill_matrix:
+
+- memory: deep memory_usage of the melted frame vs the matrix
+- build: survey frame -> per-gender skill shares (build_kaggle_skills)
+- slice: per-gender counts for one country and experience band
+- co-occurrence: per-gender share of Python users using each other skill
+  (a self-merge of the melted frame vs co_occurrence)
+
+The melt path is skipped at 30x (its frame alone would be about 8 GB);
+the raw survey frame itself does not fit in memory at 100x.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_kaggle_matrix.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from kaggle_survey import (KEPT_COLUMNS, PROFILE_COLUMNS, co_occurrence, count_skills_by_gender,
+                           gender_shares, skill_counts, skill_counts_long, skill_matrix)
+from bench_stages import KAGGLE_RESPONDENTS, synthetic_survey_frame
+
+SCALES = [1, 10, 30]
+MELT_SCALES = [1, 10]
+
+## Slice used for the filtered counts
+COUNTRY = "India"
+EXPERIENCE = "0-1"
+
+
+def best_of(func, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def survey_frame(respondents):
+    """Synthetic survey as read_survey returns it (unticked skills missing)."""
+    return synthetic_survey_frame(respondents).replace("", np.nan)
+
+
+def melt_skills(kaggle):
+    """The melted (profile..., programming_skill) frame the munging used to build."""
+    kaggle = kaggle[list(KEPT_COLUMNS)].rename(columns=KEPT_COLUMNS)
+    kaggle_tidy = pd.melt(kaggle, id_vars=PROFILE_COLUMNS, var_name="q16", value_name="programming_skill")
+    return kaggle_tidy.drop(labels=0, axis=0).drop(labels="q16", axis=1)
+
+
+def melt_shares(kaggle):
+    return gender_shares(count_skills_by_gender(melt_skills(kaggle)))
+
+
+def matrix_shares(kaggle):
+    return gender_shares(skill_counts_long(skill_matrix(kaggle)))
+
+
+def melt_slice(tidy):
+    chosen = tidy[(tidy["country"] == COUNTRY) & (tidy["experience_years"] == EXPERIENCE)]
+    return count_skills_by_gender(chosen)
+
+
+def matrix_slice(matrix):
+    return skill_counts(matrix[(matrix["country"] == COUNTRY) & (matrix["experience_years"] == EXPERIENCE)])
+
+
+def melt_python_overlap(tidy):
+    """Per gender, share of Python users using each skill (self-merge on respondent)."""
+    # melt stacks the 18 parts of every survey row (question row included, its
+    # first cell dropped), so the row a melted index comes from is index % rows
+    rows = (len(tidy) + 1) // 18
+    used = tidy[["gender", "programming_skill"]].dropna()
+    used = used.assign(respondent=used.index % rows)
+    python = used.loc[used["programming_skill"] == "Python", ["respondent"]]
+    both = used.merge(python, on="respondent")
+    return both.groupby(["gender", "programming_skill"]).size() / both[both["programming_skill"] == "Python"].groupby("gender").size()
+
+
+def matrix_python_overlap(matrix):
+    return co_occurrence(matrix, by="gender").xs("Python", level="skill")
+
+
+def main():
+    print(f"{'scale':>6} {'respondents':>12} {'path':>7} {'memory (MB)':>12} {'build (s)':>10} {'slice (s)':>10} {'co-occ (s)':>11}")
+    for scale in SCALES:
+        respondents = KAGGLE_RESPONDENTS * scale
+        kaggle = survey_frame(respondents)
+
+        if scale in MELT_SCALES:
+            tidy = melt_skills(kaggle)
+            memory = tidy.memory_usage(deep=True).sum() / 1e6
+            build = best_of(melt_shares, kaggle, repeat=1)
+            chosen = best_of(melt_slice, tidy)
+            overlap = best_of(melt_python_overlap, tidy, repeat=1)
+            print(f"{scale:>6} {respondents:>12,} {'melt':>7} {memory:>12.1f} {build:>10.4f} {chosen:>10.4f} {overlap:>11.4f}")
+
+            # sanity check: both paths give the same shares
+            pd.testing.assert_frame_equal(melt_shares(kaggle), matrix_shares(kaggle))
+            shares = matrix_python_overlap(skill_matrix(kaggle)).stack()
+            assert np.allclose(melt_python_overlap(tidy).reindex(shares.index, fill_value=0), shares)
+            del tidy
+
+        matrix = skill_matrix(kaggle)
+        memory = matrix.memory_usage(deep=True).sum() / 1e6
+        build = best_of(matrix_shares, kaggle, repeat=1)
+        chosen = best_of(matrix_slice, matrix)
+        overlap = best_of(matrix_python_overlap, matrix)
+        print(f"{scale:>6} {respondents:>12,} {'matrix':>7} {memory:>12.1f} {build:>10.4f} {chosen:>10.4f} {overlap:>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
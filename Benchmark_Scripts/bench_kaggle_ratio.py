@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: per-gender skill ratio of the Kaggle survey
+
+Times the groupby count + groupby-transform ratio used by
+kaggle-data-munging.py on synthetic melted survey frames from 20k to 5M rows,
+next to the old row-by-row loop over the aggregated table.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_kaggle_ratio.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from kaggle_survey import count_skills_by_gender, share_within_gender
+
+SIZES = [20_000, 100_000, 500_000, 1_000_000, 5_000_000]
+
+GENDERS = ["Male", "Female", "Prefer not to say", "Prefer to self-describe"]
+GENDER_WEIGHTS = [0.80, 0.17, 0.02, 0.01]
+SKILLS = ["Python", "R", "SQL", "Bash", "Java", "Javascript/Typescript",
+          "Visual Basic/VBA", "C/C++", "MATLAB", "Scala", "Julia", "Go",
+          "C#/.NET", "PHP", "Ruby", "SAS/STATA", "None", "Other"]
+
+
+def synthetic_tidy(n_rows, seed=0):
+    """Melted (gender, programming_skill) frame like kaggle_tidy."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "gender": rng.choice(GENDERS, size=n_rows, p=GENDER_WEIGHTS),
+        "programming_skill": rng.choice(SKILLS, size=n_rows),
+    })
+
+
+def legacy_ratio(kaggle_agg):
+    """The original loop from kaggle-data-munging.py, kept for comparison."""
+    kaggle_agg = kaggle_agg.copy()
+    gender_counts = kaggle_agg.groupby(['gender'])['counts'].sum().reset_index(name = "counts")
+    kaggle_agg["ratio"] = None
+    with pd.option_context("mode.chained_assignment", None):
+        for index in kaggle_agg.index:
+            if kaggle_agg["gender"][index] == "Male":
+                kaggle_agg["ratio"][index] = kaggle_agg["counts"][index]/gender_counts.loc[gender_counts['gender'] == "Male", 'counts'].iloc[0]
+            elif kaggle_agg["gender"][index] == "Female":
+                kaggle_agg["ratio"][index] = kaggle_agg["counts"][index]/gender_counts.loc[gender_counts['gender'] == "Female", 'counts'].iloc[0]
+    return kaggle_agg
+
+
+def best_of(func, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    print(f"{'rows':>10} {'count (s)':>10} {'ratio (s)':>10} {'loop (s)':>10} {'rows/s':>14}")
+    for n_rows in SIZES:
+        kaggle_tidy = synthetic_tidy(n_rows)
+        count_time = best_of(count_skills_by_gender, kaggle_tidy)
+        kaggle_agg = count_skills_by_gender(kaggle_tidy)
+        ratio_time = best_of(share_within_gender, kaggle_agg)
+        loop_time = best_of(legacy_ratio, kaggle_agg, repeat=1)
+
+        # sanity check: the vectorized ratios match the loop for Male/Female
+        check = legacy_ratio(kaggle_agg)
+        keep = check["gender"].isin(["Male", "Female"])
+        assert np.allclose(check.loc[keep, "ratio"].astype(float),
+                           share_within_gender(kaggle_agg)[keep])
+
+        throughput = n_rows / (count_time + ratio_time)
+        print(f"{n_rows:>10,} {count_time:>10.4f} {ratio_time:>10.4f} {loop_time:>10.4f} {throughput:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
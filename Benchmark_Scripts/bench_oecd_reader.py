@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: reading the OECD students export
+
+Compares the old load of OECD_students_munging.py (read all 17 columns as
+object, drop 11 of them, filter the "Latest available year" rows, cast Year)
+with oecd_reader.read_oecd (6 typed columns, sentinel dropped on the
+categories) on Raw_Datasets/OECD_StudentsByGenderField.csv and on copies
+scaled 10x and 100x, written to a temporary directory. Reports time and the
+memory of the resulting frame.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_oecd_reader.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from oecd_reader import read_oecd
+
+SCALES = [1, 10, 100]
+RAW = "Raw_Datasets/OECD_StudentsByGenderField.csv"
+DIMENSIONS = ["COUNTRY", "Country", "Gender", "Field"]
+
+
+def legacy_read(csv_path):
+    """Section 1-3 of the original OECD_students_munging.py."""
+    students = pd.read_csv(csv_path)
+    students = students.drop(
+        columns=[
+            "INDICATOR", "Indicator", "EDUCATION_LEV", "Education level", "SEX", "MOBILITY",
+            "Mobility status", "EDUCATION_FIELD", "YEAR", "Flag Codes", "Flags",
+        ]
+    )
+    students = students[students["Year"] != "Latest available year"]
+    return students.astype({"Year": int})
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def megabytes(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    raw = pd.read_csv(RAW, dtype=str, keep_default_na=False)
+    print(f"{'scale':>6} {'rows':>10} {'legacy (s)':>11} {'typed (s)':>10} {'speedup':>8} "
+          f"{'legacy MB':>10} {'typed MB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in SCALES:
+            csv_path = os.path.join(tmp, f"students_{factor}.csv")
+            pd.concat([raw] * factor, ignore_index=True).to_csv(csv_path, index=False, encoding="utf-8-sig")
+            legacy, legacy_time = timed(legacy_read, csv_path)
+            typed, typed_time = timed(read_oecd, csv_path, DIMENSIONS)
+            pd.testing.assert_frame_equal(
+                legacy[typed.columns].astype({col: "category" for col in DIMENSIONS}),
+                typed,
+                check_categorical=False,
+            )
+            print(f"{factor:>5}x {len(typed):>10,} {legacy_time:>11.3f} {typed_time:>10.3f} "
+                  f"{legacy_time / typed_time:>7.1f}x {megabytes(legacy):>10.1f} {megabytes(typed):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: gender gap reshape of the OECD students data
+
+Compares the old path of OECD_students_munging.py (pivot by Gender, np.select
+for the STEM status, pivot by Field) with oecd_students.gender_gap +
+difference_by_field (key columns read as categoricals) on Raw_Datasets/OECD_StudentsByGenderField.csv and on
+copies scaled 10x and 100x.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_oecd_students.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from oecd_students import difference_by_field, gender_gap
+
+SCALES = [1, 10, 100]
+CATEGORIES = ["COUNTRY", "Country", "Gender", "Field"]
+
+STEM = [
+    "Agriculture, forestry, fisheries and veterinary",
+    "Engineering, manufacturing and construction",
+    "Health and welfare",
+    "Information and Communication Technologies (ICTs)",
+    "Natural sciences, mathematics and statistics",
+]
+NON_STEM = [
+    "Arts and humanities",
+    "Business, administration and law",
+    "Education",
+    "Generic programmes and qualifications",
+    "Services",
+    "Social sciences, journalism and information",
+]
+
+
+def legacy_reshape(students_clean):
+    """The original section 5 of OECD_students_munging.py.
+
+    Its Ratio.replace(["inf"], 0) never matched infinity; np.inf is used here
+    so that the results can be compared.
+    """
+    students_wide = students_clean.pivot(
+        index=["COUNTRY", "Country", "Year", "Field"], columns="Gender", values="Value"
+    ).reset_index()
+    students_wide["Ratio"] = students_wide["Male"] / students_wide["Female"]
+    students_wide["Ratio"] = students_wide["Ratio"].replace([np.inf], 0)
+    students_wide["Difference"] = students_wide["Male"] - students_wide["Female"]
+    conditions = [students_wide["Field"].isin(STEM), students_wide["Field"].isin(NON_STEM)]
+    students_wide["STEM_Status"] = np.select(conditions, ["STEM", "Non-STEM"], default=" ")
+    students_long = students_wide.pivot(
+        index=["COUNTRY", "Country", "Year"], columns="Field", values="Difference"
+    )
+    return students_wide, students_long
+
+
+def as_categories(df):
+    """The key columns as categoricals, as OECD_students_munging.py reads them."""
+    return df.astype({col: "category" for col in CATEGORIES})
+
+
+def plain(df):
+    """Categorical columns back to object, to compare with the pivot results."""
+    return df.astype({col: object for col in df.columns if df[col].dtype == "category"})
+
+
+def coded_reshape(students_clean):
+    students_wide = gender_gap(students_clean)
+    return students_wide, difference_by_field(students_wide)
+
+
+def load():
+    students = pd.read_csv("Raw_Datasets/OECD_StudentsByGenderField.csv")
+    students = students[["COUNTRY", "Country", "Gender", "Field", "Year", "Value"]]
+    students = students[students["Year"] != "Latest available year"]
+    students = students.astype({"Year": int})
+    return students[students["Value"].notna()]
+
+
+def scaled(df, factor):
+    """Repeat every country `factor` times under new codes."""
+    copies = []
+    for i in range(factor):
+        copy = df.copy()
+        copy["COUNTRY"] = copy["COUNTRY"] + str(i)
+        copy["Country"] = copy["Country"] + f" {i}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    students_clean = load()
+
+    print(f"{'scale':>6} {'rows':>10} {'pivot (s)':>10} {'coded (s)':>10} {'speedup':>8}")
+    for factor in SCALES:
+        data = scaled(students_clean, factor)
+        (legacy_wide, legacy_long), legacy_time = timed(legacy_reshape, data)
+        (coded_wide, coded_long), coded_time = timed(coded_reshape, as_categories(data))
+        columns = ["COUNTRY", "Country", "Year", "Field", "Female", "Male", "Ratio", "Difference", "STEM_Status"]
+        pd.testing.assert_frame_equal(
+            legacy_wide[columns].rename_axis(columns=None), plain(coded_wide[columns]), check_dtype=False
+        )
+        pd.testing.assert_frame_equal(
+            legacy_long.rename_axis(columns=None).reset_index(), plain(coded_long.reset_index())
+        )
+        print(f"{factor:>5}x {len(data):>10,} {legacy_time:>10.3f} {coded_time:>10.3f} "
+              f"{legacy_time / coded_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: every munging and visualization stage at 1, 10 and 100x the data
+
+Builds a scratch copy of the repository for each scale (scripts, checked-in
+clean datasets and scaled raw datasets) and runs Pipeline_Scripts/run_pipeline.py
+in it one stage at a time, recording the wall time, peak RSS and HTML size
+of each stage. At 1x the raw datasets are the
+checked-in ones. The 10x and 100x copies are synthetic:
+
+- OECD exports and PISA zip: the rows are repeated with "-<k>" appended to
+  the country codes and names, so every copy is a new country. The country
+  filters of the charts drop these copies again.
+- OWID file: the rows are repeated unchanged. The fertility chart keeps only
+  OECD members by exact name, so renamed copies would never reach it; with
+  the names kept every copy is charted.
+- Census STEM workbook: the table body is repeated.
+- Kaggle survey: the export is not checked in, so a synthetic survey is
+  written with 23,859 respondents per 1x (the 2018 survey's size). A real
+  multipleChoiceResponses.csv is repeated instead if it is present.
+
+Results are written to a CSV (one row per scale and stage) that can be
+diffed across commits. R stages show up as failed when Rscript is not installed.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_stages.py
+    python Benchmark_Scripts/bench_stages.py --scales 1 10 --output before.csv
+    python Benchmark_Scripts/bench_stages.py oecd_students_chart    # and its upstream stages
+"""
+
+# importing necessary libraries
+import argparse
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Pipeline_Scripts"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from run_pipeline import ROOT, STAGES
+from oecd_test_score_munging import SUBJECT_FILES
+from bench_kaggle_ratio import GENDER_WEIGHTS, GENDERS, SKILLS
+
+SCALES = [1, 10, 100]
+OUTPUT = "Benchmark_Scripts/stage_benchmarks.csv"
+FIELDS = ["scale", "stage", "status", "wall_s", "peak_rss_mb", "html_bytes"]
+
+## Copied into every scratch tree as they are
+TREE_DIRS = ["Munging_Scripts", "Analysis_Scripts", "Pipeline_Scripts", "Clean_Datasets", "Raw_Datasets"]
+
+## Country columns of the raw CSVs: copy k of a row gets "-<k>" appended to them
+## (none for the OWID file, see above)
+COUNTRY_COLUMNS = {
+    "Raw_Datasets/OECD_StudentsByGenderField.csv": ["COUNTRY", "Country"],
+    "Raw_Datasets/OECD_ParentalLeave.csv": ["COU", "Country"],
+    "Raw_Datasets/fertility-and-female-labor-force-participation.csv": [],
+}
+TEST_SCORES = "Raw_Datasets/OECD_TestScores.zip"
+TEST_SCORES_COLUMNS = ["LOCATION"]
+STEM_WORKBOOK = "Raw_Datasets/Table1_STEM _STEM-Related_Occupations (1).xlsx"
+
+## Kaggle survey export and the size of the synthetic one at 1x
+KAGGLE_SURVEY = "Raw_Datasets/Kaggle_WomenInDataScience/multipleChoiceResponses.csv"
+KAGGLE_RESPONDENTS = 23_859
+KAGGLE_PROFILE = {
+    "Q1": GENDERS,
+    "Q2": ["18-21", "22-24", "25-29", "30-34", "35-39", "40-44", "45-49", "50-54", "55-59", "60+"],
+    "Q3": ["United States of America", "India", "China", "Germany", "Brazil", "Other"],
+    "Q4": ["Bachelor's degree", "Master's degree", "Doctoral degree", "Professional degree"],
+    "Q5": ["Computer science", "Engineering", "Mathematics or statistics", "Physics or astronomy"],
+    "Q6": ["Data Scientist", "Software Engineer", "Data Analyst", "Student", "Other"],
+    "Q7": ["Computers/Technology", "Academics/Education", "Accounting/Finance", "Other"],
+    "Q8": ["0-1", "1-2", "2-3", "3-4", "4-5", "5-10", "10-15", "15-20", "20-25"],
+    "Q9": ["0-10,000", "10-20,000", "50-60,000", "100-125,000", "I do not wish to disclose"],
+}
+
+
+def replicate(df, factor, columns):
+    """df followed by factor - 1 copies whose non-empty `columns` end in "-<k>"."""
+    copies = [df]
+    for k in range(1, factor):
+        suffixed = {col: df[col].where(df[col] == "", df[col] + f"-{k}") for col in columns}
+        copies.append(df.assign(**suffixed))
+    return pd.concat(copies, ignore_index=True)
+
+
+def read_text(csv_file):
+    """A CSV with every cell as the string in the file (no NA parsing)."""
+    return pd.read_csv(csv_file, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+
+
+def scale_csv(path, factor, columns):
+    replicate(read_text(path), factor, columns).to_csv(path, index=False)
+
+
+def scale_zip(path, factor, columns, members=SUBJECT_FILES):
+    """Rewrite a zip archive with its CSV `members` scaled (the other members are left out)."""
+    with zipfile.ZipFile(path) as archive:
+        tables = {name: read_text(archive.open(name)) for name in members}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, df in tables.items():
+            archive.writestr(name, replicate(df, factor, columns).to_csv(index=False))
+
+
+def scale_workbook(path, factor, unit_label="Estimate", marker=":"):
+    """Repeat the body of a Census table (first category header to the next blank row)."""
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    rows = list(workbook.worksheets[0].iter_rows(values_only=True))
+    workbook.close()
+    units = next(i for i, row in enumerate(rows) if unit_label in row)
+    start = next(
+        i for i in range(units + 1, len(rows))
+        if isinstance(rows[i][0], str) and rows[i][0].rstrip().endswith(marker)
+    )
+    end = next((i for i in range(start, len(rows)) if all(v is None for v in rows[i])), len(rows))
+
+    scaled = openpyxl.Workbook(write_only=True)
+    sheet = scaled.create_sheet()
+    for row in rows[:start] + rows[start:end] * factor + rows[end:]:
+        sheet.append(row)
+    scaled.save(path)
+
+
+def synthetic_survey_frame(respondents, seed=0):
+    """Kaggle-like survey export: the kept questions plus the 18 Q16 parts.
+
+    Row 1 repeats the question text as in the real export; every respondent
+    ticks each programming language with a fixed probability.
+    """
+    rng = np.random.default_rng(seed)
+    survey = {
+        question: rng.choice(answers, size=respondents, p=GENDER_WEIGHTS if question == "Q1" else None)
+        for question, answers in KAGGLE_PROFILE.items()
+    }
+    for part, skill in enumerate(SKILLS, start=1):
+        ticked = rng.random(respondents) < (0.6 if skill == "Python" else 0.15)
+        survey[f"Q16_Part_{part}"] = np.where(ticked, skill, "")
+    survey = pd.DataFrame(survey)
+    questions = pd.DataFrame([{col: f"Question {col}" for col in survey.columns}])
+    return pd.concat([questions, survey], ignore_index=True)
+
+
+def synthetic_survey(path, respondents, seed=0):
+    """Write synthetic_survey_frame to `path` as the survey CSV."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    synthetic_survey_frame(respondents, seed).to_csv(path, index=False)
+
+
+def build_tree(tree, factor):
+    """Scratch copy of the repository with the raw datasets scaled by `factor`."""
+    for name in TREE_DIRS:
+        shutil.copytree(os.path.join(ROOT, name), os.path.join(tree, name),
+                        ignore=shutil.ignore_patterns("__pycache__"))
+    os.makedirs(os.path.join(tree, "Final_Viz"))
+
+    survey = os.path.join(tree, KAGGLE_SURVEY)
+    if os.path.exists(survey):
+        if factor > 1:
+            export = read_text(survey)
+            rows = replicate(export.iloc[1:], factor, [])
+            pd.concat([export.iloc[:1], rows], ignore_index=True).to_csv(survey, index=False)
+    else:
+        synthetic_survey(survey, KAGGLE_RESPONDENTS * factor)
+    if factor == 1:
+        return
+    for path, columns in COUNTRY_COLUMNS.items():
+        scale_csv(os.path.join(tree, path), factor, columns)
+    scale_zip(os.path.join(tree, TEST_SCORES), factor, TEST_SCORES_COLUMNS)
+    scale_workbook(os.path.join(tree, STEM_WORKBOOK), factor)
+
+
+def html_bytes(outputs):
+    """Total size of the HTML files among `outputs` ("" when there are none)."""
+    pages = [path for path in outputs if path.endswith(".html")]
+    return sum(os.path.getsize(path) for path in pages) if pages else ""
+
+
+def bench_scale(factor, stages):
+    """Run the pipeline in a scratch tree scaled by `factor`, one result row per stage.
+
+    Stages run one at a time under Pipeline_Scripts/run_pipeline.py, which
+    takes the peak RSS of each script from its own wait4 (the scripts are
+    started by the small pipeline process, not by this one holding the
+    scaled data).
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix=f"bench_stages_{factor}x_") as tree:
+        print(f"building the {factor}x tree", flush=True)
+        build_tree(tree, factor)
+        report_path = os.path.join(tree, "report.json")
+        subprocess.run(
+            [sys.executable, "Pipeline_Scripts/run_pipeline.py", "--jobs", "1", "--report", report_path, *stages],
+            cwd=tree, stdout=subprocess.DEVNULL,
+        )
+        with open(report_path) as f:
+            report = json.load(f)
+        for stage, usage in report.items():
+            ok = usage["status"] == "rebuilt"
+            peak_rss = usage.get("peak_rss_mb")
+            result = {
+                "scale": factor,
+                "stage": stage,
+                "status": "ok" if ok else usage["status"].splitlines()[0],
+                "wall_s": f"{usage['wall_s']:.3f}" if ok else "",
+                "peak_rss_mb": f"{peak_rss:.1f}" if peak_rss is not None else "",
+                "html_bytes": html_bytes(os.path.join(tree, path) for path in STAGES[stage]["outputs"]) if ok else "",
+            }
+            print(f"{factor:>5}x {stage:<26} {result['wall_s']:>9} {result['peak_rss_mb']:>9} "
+                  f"{result['html_bytes']:>12}  {result['status']}", flush=True)
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("stages", nargs="*", help="stages to benchmark, with their upstream stages (default: all)")
+    parser.add_argument("--scales", nargs="+", type=int, default=SCALES, help="data scales (default: 1 10 100)")
+    parser.add_argument("--output", default=OUTPUT, help=f"results CSV (default: {OUTPUT})")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    print(f"{'scale':>6} {'stage':<26} {'wall (s)':>9} {'RSS (MB)':>9} {'HTML (bytes)':>12}  status")
+    results = []
+    for factor in args.scales:
+        results.extend(bench_scale(factor, args.stages))
+
+    with open(args.output, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: occupation category fill of the Census STEM tables
+
+Compares the old element-by-element loop from stem_jobs_munging.py with the
+vectorized header detection + ffill (and the nested-level variant) on a
+synthetic 100k-row occupation table.
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_stem_categories.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from stem_jobs_parsing import fill_category_levels, fill_occupation_categories
+
+N_ROWS = 100_000
+
+
+def synthetic_labels(n_rows, seed=0):
+    """Raw occupation labels: a ".Total" header every ~400 rows, a
+    "..category" header every ~20 rows, occupations in between."""
+    rng = np.random.default_rng(seed)
+    draws = rng.random(n_rows)
+    labels = np.where(
+        draws < 0.0025,
+        [f".Total group {i}:" for i in range(n_rows)],
+        np.where(
+            draws < 0.05,
+            [f"..Category {i}:" for i in range(n_rows)],
+            [f"...Occupation {i}" for i in range(n_rows)],
+        ),
+    )
+    labels[0] = ".Total group 0:"
+    return pd.Series(labels)
+
+
+def legacy_fill(occupation):
+    """The original loop from stem_jobs_munging.py, kept for comparison."""
+    is_header = occupation.str.contains(':')
+    occupation_category = [0]*len(occupation)
+    for i in range(len(is_header)):
+        if is_header[i] == True:
+            occupation_category[i] = occupation[i]
+            j = occupation[i]
+        else:
+            occupation_category[i] = j
+    return occupation_category
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    raw_labels = synthetic_labels(N_ROWS)
+    occupation = raw_labels.str.strip('...')
+
+    legacy, legacy_time = timed(legacy_fill, occupation)
+    vectorized, vectorized_time = timed(fill_occupation_categories, occupation)
+    _, levels_time = timed(fill_category_levels, raw_labels)
+
+    assert vectorized.tolist() == legacy
+
+    print(f"rows: {N_ROWS:,}")
+    print(f"loop:                {legacy_time:8.4f} s")
+    print(f"vectorized ffill:    {vectorized_time:8.4f} s  ({legacy_time / vectorized_time:,.0f}x)")
+    print(f"nested level ffill:  {levels_time:8.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: ingesting the Census STEM occupation workbook
+
+Compares the old load of stem_jobs_munging.py (pd.read_excel of the whole
+sheet, then positional slicing) with stem_jobs_parsing.parse_census_table
+(streaming read of the table body only) and with read_census_table on a
+warm cache, for 1, 10 and 100 workbook reads (we ingest dozens of these
+workbooks).
+
+Run from the repository root:
+    python Benchmark_Scripts/bench_stem_excel.py
+"""
+
+# importing necessary libraries
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Munging_Scripts"))
+from stem_jobs_parsing import parse_census_table, read_census_table
+
+SCALES = [1, 10, 100]
+WORKBOOK = "Raw_Datasets/Table1_STEM _STEM-Related_Occupations (1).xlsx"
+ESTIMATE_COLUMNS = [0, 1, 3, 5, 7, 9, 11, 13, 15]
+
+
+def legacy_read(path):
+    """The original load and slicing of stem_jobs_munging.py."""
+    table = pd.read_excel(path, index_col=None, header=None)
+    table = table.drop(table.index[0:10])
+    table = table.drop(table.index[130:])
+    return table.reset_index()[ESTIMATE_COLUMNS]
+
+
+def timed(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # same rows as the old slicing, plus the ".Total STEM2 Occupations:" header above them
+        streamed = parse_census_table(WORKBOOK)
+        pd.testing.assert_frame_equal(
+            streamed.iloc[1:].reset_index(drop=True), legacy_read(WORKBOOK), check_column_type=False
+        )
+        read_census_table(WORKBOOK, cache_dir)
+
+        print(f"{'reads':>6} {'read_excel (s)':>15} {'streamed (s)':>13} {'cached (s)':>11}")
+        for factor in SCALES:
+            _, legacy_time = timed(legacy_read, WORKBOOK, repeat=factor)
+            _, streamed_time = timed(parse_census_table, WORKBOOK, repeat=factor)
+            _, cached_time = timed(read_census_table, WORKBOOK, cache_dir, repeat=factor)
+            print(f"{factor:>6} {legacy_time:>15.3f} {streamed_time:>13.3f} {cached_time:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
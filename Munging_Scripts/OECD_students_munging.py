@@ -7,106 +7,58 @@ Created on Mon Mar 21 12:30:08 2022
 
 Munging for OECD Students by Field - by Gender
 Data Source: https://stats.oecd.org/Index.aspx?QueryId=109881
+
+read_students and build_oecd_students_long can be imported (nothing runs on
+import); running the file writes Clean_Datasets/OECD_LaborForce_Data.csv:
+    python Munging_Scripts/OECD_students_munging.py
 """
 
 ## Load in necessary packages
-import pandas as pd
-import numpy as np
-
-
-## Load in necessary data
-students = pd.read_csv("Raw_Datasets/OECD_StudentsByGenderField.csv")
-
-
-## MUNGING
-# 1. Examine data + columns
-students.head()
-for col in students.columns:
-    print(col)
-
-# Summary statistics
-students.describe()
-
-# 2. Remove unnecessary columns before further cleaning
-students_clean = students.drop(
-    columns=[
-        "INDICATOR",
-        "Indicator",
-        "EDUCATION_LEV",
-        "Education level",
-        "SEX",
-        "MOBILITY",
-        "Mobility status",
-        "EDUCATION_FIELD",
-        "YEAR",
-        "Flag Codes",
-        "Flags",
-    ]
-)
-print(students_clean)
-
-
-# 3. Fix incorrect values
-students_clean = students_clean[students_clean["Year"] != "Latest available year"]
-
-# 4. Count NAs across the whole dataframe
-students_clean.isna().sum()  # 4,585 NAs in column "Value" --> these are useless to us
-
-# Remove rows with NAs for "Value"
-students_clean = students_clean[students_clean["Value"].notna()]
-
-# Filter out EU and OECD totals later
-
-# 5. Spread
-students_wide = students_clean.pivot(
-    index=["COUNTRY", "Country", "Year", "Field"], columns="Gender", values="Value"
-)
-
-# Make indices into columns
-students_wide = students_wide.reset_index(level=["COUNTRY", "Country", "Year", "Field"])
-
-# 5. Feature generation
-## Add column "Ratio" for the ratio of male to female entrants in each field (by year and country)
-students_wide["Ratio"] = students_wide["Male"] / students_wide["Female"]
-students_wide["Ratio"] = students_wide["Ratio"].replace(["inf"], 0)
-
-## Add column "Difference" for the percentage points higher men are than women
-students_wide["Difference"] = students_wide["Male"] - students_wide["Female"]
-
-## Add column "STEM_Status" to indicate whether the field is a stem or non-stem field
-students_wide["STEM_Status"] = np.select(
-    [
-        students_wide["Field"].isin(
-            [
-                "Agriculture, forestry, fisheries and veterinary",
-                "Engineering, manufacturing and construction",
-                "Health and welfare",
-                "Information and Communication Technologies (ICTs)",
-                "Natural sciences, mathematics and statistics",
-            ]
-        ),
-        students_wide["Field"].isin(
-            [
-                "Arts and humanities",
-                "Business, administration and law",
-                "Education",
-                "Generic programmes and qualifications",
-                "Services",
-                "Social sciences, journalism and information",
-            ]
-        ),
-    ],
-    ["STEM", "Non-STEM"],
-    default=" ",
-)
-
-## Now gather back (want each field's Difference)
-students_long = students_wide[["COUNTRY", "Country", "Year", "Field", "Difference", "STEM_Status"]]
-students_long = students_long.pivot(
-    index=["COUNTRY", "Country", "Year", "STEM_Status"], columns="Field", values="Difference"
-)
-
-
-# Write to csv
-# students_wide.to_csv("Clean_Datasets/OECD_Students.csv", index=False)
-students_long.to_csv("Clean_Datasets/OECD_LaborForce_Data.csv", index = True)
+from clean_store import write_clean
+from oecd_reader import read_oecd
+from oecd_students import difference_by_field, gender_gap
+
+## Raw export and clean dataset
+RAW = "Raw_Datasets/OECD_StudentsByGenderField.csv"
+OUTPUT = "Clean_Datasets/OECD_LaborForce_Data.csv"
+
+
+def read_students(csv_path=RAW):
+    """Load in necessary data.
+
+    Only the columns used below: country, gender and field as categoricals
+    (the reshape works on their codes), Year as integers without the
+    "Latest available year" rows (see oecd_reader.py). Unnecessary columns
+    (indicator, education level, mobility, flags and the code twin of every
+    label) are left out.
+    """
+    return read_oecd(csv_path, dimensions=["COUNTRY", "Country", "Gender", "Field"])
+
+
+def build_oecd_students_long(students):
+    """Difference between the share of men and women entering each field.
+
+    One row per country, year and STEM status, one column per field (the
+    layout of OECD_LaborForce_Data.csv).
+    """
+    ## MUNGING
+    # Remove rows with NAs for "Value" (4,585 of them) --> these are useless to us
+    students_clean = students[students["Value"].notna()]
+
+    # Filter out EU and OECD totals later
+
+    # Spread + feature generation
+    ## Align Male and Female values per country, year and field (fields are coded
+    ## through the lookup table in oecd_students.py) and add:
+    ## "Ratio" for the ratio of male to female entrants in each field (by year and country),
+    ## "Difference" for the percentage points higher men are than women and
+    ## "STEM_Status" to indicate whether the field is a stem or non-stem field
+    students_wide = gender_gap(students_clean)
+
+    ## Now gather back (want each field's Difference) with a single unstack
+    return difference_by_field(students_wide)
+
+
+if __name__ == "__main__":
+    # Write to csv (plus the typed Feather copy the viz script prefers)
+    write_clean(build_oecd_students_long(read_students()), OUTPUT, index=True)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Atomic writes for files other processes may read while they are written
+
+atomic_write writes under a temporary name next to the target and renames
+it into place only once the file is complete, so a reader (a chart loading
+the shared plotly.js, a batch worker reading the Excel cache, a chart
+loading the Kaggle cube) never sees half a file. Used by
+stem_jobs_parsing.py, kaggle_cube.py and Analysis_Scripts/plotly_assets.py.
+"""
+
+# importing necessary libraries
+import contextlib
+import os
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode="w", **open_args):
+    """open(path, mode) whose file only replaces `path` if the block finishes without error."""
+    partial_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(partial_path, mode, **open_args) as f:
+            yield f
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typed columnar copies of the Clean_Datasets CSVs
+
+Next to every clean CSV the munging scripts also write an uncompressed
+Feather (Arrow IPC) file with the same columns, where the country, field,
+gender and subject columns are stored as categoricals. The analysis scripts
+read that copy through Analysis_Scripts/clean_data.py when it is at least as
+new as the CSV, which skips CSV type inference and can be memory-mapped.
+
+Run this file directly to refresh the Feather copies of the given CSVs, or
+of every CSV in Clean_Datasets (e.g. after the R munging scripts have run):
+    python Munging_Scripts/clean_store.py [Clean_Datasets/<name>.csv ...]
+"""
+
+# importing necessary libraries
+import glob
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+except ImportError:  # the CSVs are still written, only the typed copy is skipped
+    pyarrow = None
+
+## Columns stored as categoricals (matched case-insensitively)
+CATEGORICAL_COLUMNS = {"country", "country_code", "field", "gender", "subject"}
+
+
+def feather_path(csv_path):
+    """Path of the Feather copy that belongs to a clean CSV."""
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+
+def to_typed(df):
+    """Return a copy of df with the categorical columns converted.
+
+    Other object columns get the type read_csv would give them back: numeric
+    if they only hold numbers, text if they mix numbers and text (e.g. the
+    "250,000+" earnings in STEM_jobs).
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(df[col], skipna=True)
+        if str(col).lower() in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif kind in ("integer", "floating", "mixed-integer-float"):
+            df[col] = pd.to_numeric(df[col])
+        elif kind.startswith("mixed"):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def write_feather_copy(df, csv_path):
+    """Write the typed Feather copy of a clean dataset, if pyarrow is available."""
+    if pyarrow is None:
+        print(f"pyarrow not installed, skipping {feather_path(csv_path)}")
+        return
+    # Feather only stores a default index, so named index levels become columns
+    if not isinstance(df.index, pd.RangeIndex) or df.index.name is not None:
+        df = df.reset_index()
+    # the CSV does not keep a columns name either (e.g. "Field" after a pivot)
+    df = df.rename_axis(columns=None)
+    to_typed(df).reset_index(drop=True).to_feather(
+        feather_path(csv_path), compression="uncompressed"
+    )
+
+
+def write_clean(df, csv_path, index=False, **csv_options):
+    """Write a clean dataset as CSV (as before) plus its typed Feather copy.
+
+    Extra keyword arguments go to DataFrame.to_csv.
+    """
+    df.to_csv(csv_path, index=index, **csv_options)
+    write_feather_copy(df if index else df.reset_index(drop=True), csv_path)
+
+
+def r_csv_field(values):
+    """Text of one column as R's write.csv writes it (quoted text, NA, 15 digits)."""
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        text = pd.Series(np.char.mod("%.15g", values.to_numpy(dtype=float)), index=values.index)
+    else:
+        text = '"' + values.astype(str).str.replace('"', '""', regex=False) + '"'
+    return text.where(values.notna(), "NA")
+
+
+def write_clean_r(df, csv_path):
+    """Write a clean dataset in the layout of R's write.csv, plus its typed Feather copy.
+
+    The index is written as the quoted row names column with an empty header,
+    as the R munging scripts wrote it. Columns are formatted whole with
+    vectorized string operations, then joined per row; the Feather copy is
+    read back from that text.
+    """
+    fields = [r_csv_field(df.index.to_series().astype(str))]
+    fields += [r_csv_field(df[col]) for col in df.columns]
+    header = ",".join(['""'] + ['"' + str(col).replace('"', '""') + '"' for col in df.columns])
+    rows = fields[0].str.cat(fields[1:], sep=",")
+    with open(csv_path, "w", newline="") as f:
+        f.write("\n".join([header] + rows.tolist()) + "\n")
+    # the typed copy is built from the CSV as written (numbers rounded to 15
+    # digits, the row names column as "Unnamed: 0"), so both hold the same values
+    write_feather_copy(pd.read_csv(csv_path), csv_path)
+
+
+if __name__ == "__main__":
+    # refresh the typed copies of the given clean CSVs (default: all of them,
+    # including the R outputs)
+    for csv_path in sys.argv[1:] or sorted(glob.glob("Clean_Datasets/*.csv")):
+        write_feather_copy(pd.read_csv(csv_path), csv_path)
+        print(f"wrote {feather_path(csv_path)}")
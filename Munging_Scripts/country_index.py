@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Country membership index shared by the munging and the altair charts
+
+Countries are identified by ISO3 code. Membership is an exact isin against
+a code set (a hash lookup per row), and data that only has country names
+(the OWID file) is joined to the codes through its categories, i.e. one
+lookup per distinct name. No substring matching: "United States Virgin
+Islands" is not "United States".
+"""
+
+# importing necessary libraries
+import pandas as pd
+
+## OECD members: ISO3 code -> country name as spelled in the OWID data
+OECD_MEMBERS = {
+    "AUS": "Australia",
+    "AUT": "Austria",
+    "BEL": "Belgium",
+    "CAN": "Canada",
+    "CHE": "Switzerland",
+    "CHL": "Chile",
+    "COL": "Colombia",
+    "CRI": "Costa Rica",
+    "CZE": "Czechia",
+    "DEU": "Germany",
+    "DNK": "Denmark",
+    "ESP": "Spain",
+    "EST": "Estonia",
+    "FIN": "Finland",
+    "FRA": "France",
+    "GBR": "United Kingdom",
+    "GRC": "Greece",
+    "HUN": "Hungary",
+    "IRL": "Ireland",
+    "ISL": "Iceland",
+    "ISR": "Israel",
+    "ITA": "Italy",
+    "JPN": "Japan",
+    "KOR": "South Korea",
+    "LTU": "Lithuania",
+    "LUX": "Luxembourg",
+    "LVA": "Latvia",
+    "MEX": "Mexico",
+    "NLD": "Netherlands",
+    "NOR": "Norway",
+    "NZL": "New Zealand",
+    "POL": "Poland",
+    "PRT": "Portugal",
+    "SVK": "Slovakia",
+    "SVN": "Slovenia",
+    "SWE": "Sweden",
+    "TUR": "Turkey",
+    "USA": "United States",
+}
+
+## PISA participants with one/few data point(s), left out of the test scores chart
+PISA_SPARSE = {"COL", "CRI", "HKG", "IDN", "LTU", "MAC", "PER", "SGP", "TWN"}
+
+
+def iso3_codes(names, members=OECD_MEMBERS):
+    """ISO3 code of every country name (exact match), NaN for names not in `members`."""
+    name_to_code = {name: code for code, name in members.items()}
+    return pd.Series(names, dtype="category").map(name_to_code)
+
+
+def is_member(codes, members=OECD_MEMBERS):
+    """Boolean array: True where the ISO3 code is in `members`."""
+    return pd.Series(codes).isin(members).to_numpy()
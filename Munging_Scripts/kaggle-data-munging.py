@@ -7,114 +7,55 @@ Created on Sun Mar 27 20:39:31 2022
 """
 
 # final project: kaggle data munging
+# (the munging itself is in kaggle_survey.py, so it can be imported)
 
 # importing necessary libraries
-import pandas as pd
-import numpy as np
-import os
-
-# checking the working directory
-path = os.getcwd()
-path
-
-kaggle = pd.read_csv("Raw_Datasets/Kaggle_WomenInDataScience/multipleChoiceResponses.csv", dtype = {"Q8": "str"})
-
-# now let's take a look at the data
-kaggle.head()
-kaggle.columns
-
-# for data viz purposes let's only keep Q16 and other relevant variables
-tokeep = ["Q1", "Q2", "Q3", "Q4", "Q5", "Q6", "Q7", "Q8", "Q9", 
-          "Q16_Part_1", "Q16_Part_2", "Q16_Part_3", "Q16_Part_4", 
-          "Q16_Part_5", "Q16_Part_6", "Q16_Part_7", "Q16_Part_8", "Q16_Part_9", "Q16_Part_10", 
-          "Q16_Part_11", "Q16_Part_12", "Q16_Part_13", "Q16_Part_14", "Q16_Part_15", "Q16_Part_16", 
-          "Q16_Part_17", "Q16_Part_18"]
-
-kaggle = kaggle[tokeep]
-
-# changing to more descriptive col names
-newname = ["gender", "age", "country", "education", "undergrad_major", "professional_title", 
-           "professional_industry", "experience_years", "compensation_usd", 
-          "Q16_Part_1", "Q16_Part_2", "Q16_Part_3", "Q16_Part_4", 
-          "Q16_Part_5", "Q16_Part_6", "Q16_Part_7", "Q16_Part_8", "Q16_Part_9", "Q16_Part_10", 
-          "Q16_Part_11", "Q16_Part_12", "Q16_Part_13", "Q16_Part_14", "Q16_Part_15", "Q16_Part_16", 
-          "Q16_Part_17", "Q16_Part_18"]
-
-namingdict = dict(zip(tokeep, newname))
-
-kaggle = kaggle.rename(columns=namingdict)
-
-# it's clear that this data is in wide format, it must be in long format to be tidy
-kaggle_tidy = pd.melt(kaggle, id_vars=["gender", "age", "country", "education", "undergrad_major", 
-                                       "professional_title", "professional_industry", "experience_years", 
-                                       "compensation_usd"], 
-                     var_name = "q16", value_name="programming_skill")
-kaggle_tidy.head()
-
-# dropping first row
-kaggle_tidy = kaggle_tidy.drop(labels=0, axis=0)
-
-# dropping q16 var
-kaggle_tidy = kaggle_tidy.drop(labels="q16", axis=1)
-
-kaggle_tidy.head()
-
-# now we need to summarize by gender and count of skill
-kaggle_agg = kaggle_tidy.groupby(['gender', 'programming_skill'])['programming_skill'].size().reset_index(name = "counts")
-
-# total gender counts of those answering this Q
-gender_counts = kaggle_agg.groupby(['gender'])['counts'].sum().reset_index(name = "counts")
-
-# getting ratios as well
-kaggle_agg["ratio"] = None
-
-for index in kaggle_agg.index:
-    if kaggle_agg["gender"][index] == "Male":
-        kaggle_agg["ratio"][index] = kaggle_agg["counts"][index]/gender_counts.loc[gender_counts['gender'] == "Male", 'counts'].iloc[0]
-    elif kaggle_agg["gender"][index] == "Female":
-        kaggle_agg["ratio"][index] = kaggle_agg["counts"][index]/gender_counts.loc[gender_counts['gender'] == "Female", 'counts'].iloc[0]
+import sys
+from clean_store import write_clean
+from kaggle_bootstrap import share_intervals
+from kaggle_cube import CUBE_OUTPUT, build_cube, save_cube
+from kaggle_survey import (SURVEY, gender_shares, read_survey, skill_counts_long, skill_matrix,
+                           stream_kaggle_skills)
+
+
+def parse_jobs(argv):
+    """N of a --jobs N argument (None without one).
+
+    Raises ValueError for a --jobs without a positive whole number after it.
+    """
+    if "--jobs" not in argv:
+        return None
+    position = argv.index("--jobs")
+    value = argv[position + 1] if position + 1 < len(argv) else ""
+    if not value.isdigit() or int(value) < 1:
+        raise ValueError("usage: --jobs N (N processes for the bootstrap, e.g. --jobs 4)")
+    return int(value)
+
+
+if __name__ == "__main__":
+    # run with --stream to count skills chunk by chunk instead of loading the
+    # whole survey (keeps memory flat for the large multi-year exports; the
+    # demographics cube and the confidence intervals need the whole survey
+    # and are not rebuilt then). --jobs N bootstraps in N processes
+    try:
+        jobs = parse_jobs(sys.argv)
+    except ValueError as err:
+        sys.exit(str(err))
+    if "--stream" in sys.argv:
+        kaggle_agg = stream_kaggle_skills(SURVEY)
     else:
-        continue
-
-
-# for viz purposes let's only look at those who self identify as male or female
-kaggle_agg = kaggle_agg[(kaggle_agg.gender == "Male") | (kaggle_agg.gender == "Female")]
-
-# checking... ratios should sum to 1
-kaggle_agg.groupby(['gender'])['ratio'].sum().reset_index(name = "sum") # looks good!
-
-# now we have an aggregation ready for visualization 
-
-# saving to a csv
-kaggle_agg.to_csv("Clean_Datasets/Kaggle_WomenInDataScience_viz.csv", index=False)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+        kaggle_matrix = skill_matrix(read_survey(SURVEY))
+        kaggle_agg = gender_shares(skill_counts_long(kaggle_matrix))
 
+        # 95% bootstrap intervals of every share (ratio_low, ratio_high) and of
+        # the male - female gap of every skill (see kaggle_bootstrap.py)
+        share_ci, gap_ci = share_intervals(kaggle_matrix, jobs=jobs)
+        kaggle_agg = kaggle_agg.merge(share_ci, on=["gender", "programming_skill"], how="left")
+        write_clean(gap_ci, "Clean_Datasets/Kaggle_skill_gaps.csv")
 
+        # counts over the demographics too, so any slice can be charted
+        # later without reading the survey again (see kaggle_cube.py)
+        save_cube(build_cube(kaggle_matrix), CUBE_OUTPUT)
 
+    # saving to a csv (plus the typed Feather copy the viz script prefers)
+    write_clean(kaggle_agg, "Clean_Datasets/Kaggle_WomenInDataScience_viz.csv")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bootstrap confidence intervals for the Kaggle skill shares
+
+The ratios in Kaggle_WomenInDataScience_viz.csv (a skill's share of all
+skills a gender ticked) are point estimates; the female sample is small, so
+some of the differences between men and women are noise. share_intervals
+resamples respondents within each gender and gives percentile intervals for
+every (gender, skill) share and for the male - female gap of every skill.
+
+Only a respondent's combination of skills matters for the shares, so the
+respondents of a gender are first collapsed to their distinct skill
+combinations (skill_patterns, at most a few thousand). Resampling n
+respondents is then one multinomial draw of n over those combinations, and
+a batch of replicates is a single (replicates x combinations) draw times the
+(combinations x skills) matrix, so the cost does not grow with the survey.
+When a group has few respondents per combination, drawing n respondent
+indices and counting them per combination is cheaper and gives the same
+distribution; resampled_shares picks whichever is cheaper.
+Every batch has its own seed (spawned from `seed`), so the intervals are
+the same whether the batches run in one process or in a pool. A pool gets
+the arrays once per worker (its initializer) and every worker one block of
+consecutive batches.
+"""
+
+# importing necessary libraries
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from kaggle_survey import skill_columns
+
+## Replicates and interval level used by kaggle-data-munging.py
+REPLICATES = 2000
+LEVEL = 0.95
+
+## Replicates drawn together (memory is BATCH x skill combinations) and
+## most respondent indices drawn at once
+BATCH = 250
+INDEX_BLOCK = 5_000_000
+
+## A multinomial draw costs about as much per combination as drawing this
+## many respondent indices (measured with numpy's Generator)
+INDEX_DRAW_COST = 6
+
+## Genders the intervals are computed for (the ones the chart shows)
+GENDERS = ["Male", "Female"]
+
+## Arrays a pool worker resamples, set once by its initializer
+_worker_arrays = {}
+
+
+def skill_patterns(matrix, by="gender"):
+    """Distinct skill combinations of every `by` group and how many respondents have each.
+
+    A frame with `by`, one boolean column per skill and "respondents".
+    """
+    skills = skill_columns(matrix)
+    groups = matrix[by].astype("category").cat
+    packed = np.packbits(matrix[skills].to_numpy(), axis=1)
+    keys = np.column_stack([groups.codes.to_numpy().astype(np.int64), packed])
+    unique_keys, respondents = np.unique(keys, axis=0, return_counts=True)
+    patterns = np.unpackbits(unique_keys[:, 1:].astype(np.uint8), axis=1, count=len(skills)).astype(bool)
+    answered = unique_keys[:, 0] >= 0
+    patterns = pd.DataFrame(patterns[answered], columns=skills)
+    patterns.insert(0, by, groups.categories[unique_keys[answered, 0]])
+    patterns["respondents"] = respondents[answered]
+    return patterns
+
+
+def resampled_shares(patterns, weights, replicates, seed):
+    """Skill shares of `replicates` resamples of the respondents behind `patterns`.
+
+    `patterns` is the (combinations x skills) 0/1 array and `weights` the
+    respondents with each combination; returns a (replicates x skills) array.
+    """
+    rng = np.random.default_rng(seed)
+    respondents = weights.sum()
+    if respondents < INDEX_DRAW_COST * len(weights):
+        # respondent indices, mapped to their combination and counted per replicate
+        combination = np.repeat(np.arange(len(weights)), weights)
+        block = max(1, INDEX_BLOCK // respondents)
+        draws = []
+        for start in range(0, replicates, block):
+            size = min(block, replicates - start)
+            drawn = combination[rng.integers(0, respondents, size=(size, respondents))]
+            drawn += np.arange(size)[:, None] * len(weights)
+            draws.append(np.bincount(drawn.ravel(), minlength=size * len(weights)).reshape(size, -1))
+        draws = np.concatenate(draws)
+    else:
+        draws = rng.multinomial(respondents, weights / weights.sum(), size=replicates)
+    counts = draws @ patterns
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return counts / counts.sum(axis=1, keepdims=True)
+
+
+def _keep_arrays(patterns, weights):
+    """Pool initializer: keep the arrays every batch of this worker resamples."""
+    _worker_arrays["patterns"], _worker_arrays["weights"] = patterns, weights
+
+
+def _resampled_block(sizes, seeds):
+    """resampled_shares of consecutive batches, over the arrays _keep_arrays kept."""
+    patterns, weights = _worker_arrays["patterns"], _worker_arrays["weights"]
+    return np.concatenate([resampled_shares(patterns, weights, size, seed) for size, seed in zip(sizes, seeds)])
+
+
+def bootstrap_shares(patterns, weights, replicates=REPLICATES, seed=0, jobs=None):
+    """resampled_shares in batches of BATCH, each with its own spawned seed.
+
+    With `jobs` above 1 (capped at the number of CPUs) the batches are split
+    into one block per process of a pool.
+    """
+    sizes = [min(BATCH, replicates - start) for start in range(0, replicates, BATCH)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    patterns = patterns.astype(float)
+    jobs = min(jobs or 1, len(sizes), os.cpu_count() or 1)
+    if jobs <= 1:
+        batches = [resampled_shares(patterns, weights, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    else:
+        blocks = np.array_split(np.arange(len(sizes)), jobs)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_keep_arrays, initargs=(patterns, weights)) as pool:
+            batches = list(pool.map(_resampled_block, [[sizes[i] for i in block] for block in blocks],
+                                    [[seeds[i] for i in block] for block in blocks]))
+    return np.concatenate(batches)
+
+
+def share_intervals(matrix, replicates=REPLICATES, level=LEVEL, seed=0, jobs=None):
+    """Percentile intervals of the skill shares of each of GENDERS and of their gap.
+
+    Returns (shares, gaps). shares has gender, programming_skill, ratio_low
+    and ratio_high; gaps has programming_skill, the GENDERS[0] and
+    GENDERS[1] ratios, their difference ("gap") and its gap_low and
+    gap_high. The genders are resampled independently.
+    """
+    patterns = skill_patterns(matrix)
+    skills = skill_columns(matrix)
+    quantiles = [(1 - level) / 2, (1 + level) / 2]
+    observed, replicated, shares = {}, {}, []
+    for gender in GENDERS:
+        group = patterns[patterns["gender"] == gender]
+        weights = group["respondents"].to_numpy()
+        used = group[skills].to_numpy()
+        counts = weights @ used
+        observed[gender] = counts / counts.sum()
+        replicated[gender] = bootstrap_shares(used, weights, replicates, seed=[seed, GENDERS.index(gender)], jobs=jobs)
+        low, high = np.nanquantile(replicated[gender], quantiles, axis=0)
+        shares.append(pd.DataFrame({"gender": gender, "programming_skill": skills, "ratio_low": low, "ratio_high": high}))
+
+    first, second = GENDERS
+    low, high = np.nanquantile(replicated[first] - replicated[second], quantiles, axis=0)
+    gaps = pd.DataFrame({
+        "programming_skill": skills,
+        f"{first.lower()}_ratio": observed[first],
+        f"{second.lower()}_ratio": observed[second],
+        "gap": observed[first] - observed[second],
+        "gap_low": low,
+        "gap_high": high,
+    })
+    return pd.concat(shares, ignore_index=True), gaps.sort_values("programming_skill", ignore_index=True)
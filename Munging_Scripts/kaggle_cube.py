@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precomputed count cube over the Kaggle survey demographics
+
+build_cube counts the respondents and their programming skills once for
+every combination of the CUBE_DIMENSIONS answers (gender, country, job title
+and experience by default) into a dense integer ndarray, one axis per
+dimension (indexed by the category codes) plus a last axis for the skills.
+Any slice or roll-up is then an indexing and a sum over that array, e.g. the
+skill shares by gender of data scientists in India with 0-2 years'
+experience:
+
+    cube_skill_shares(cube, professional_title="Data Scientist",
+                      country="India", experience_years=["0-1", "1-2"])
+
+gives a table shaped like Kaggle_WomenInDataScience_viz.csv without reading
+the survey again. kaggle-data-munging.py writes the cube to CUBE_OUTPUT;
+plotly_tech_skills.py --slice charts its slices.
+
+Unanswered questions are counted under MISSING. The cube holds every
+combination, so its size is the product of the number of answers of its
+dimensions; dimension sets over MAX_CELLS cells are refused (all seven kept
+demographics together would need billions of cells).
+"""
+
+# importing necessary libraries
+import numpy as np
+import pandas as pd
+from atomic_file import atomic_write
+from kaggle_survey import counts_long, gender_shares, skill_columns
+
+## Cube written by kaggle-data-munging.py
+CUBE_OUTPUT = "Clean_Datasets/Kaggle_skills_cube.npz"
+
+## Dimensions of the default cube (all of them are skill_matrix columns)
+CUBE_DIMENSIONS = ["gender", "country", "professional_title", "experience_years"]
+
+## Label of the respondents who did not answer a dimension's question
+MISSING = "(no answer)"
+
+## Largest cube build_cube makes (int32 cells, so 4 bytes each)
+MAX_CELLS = 50_000_000
+
+
+def build_cube(matrix, dimensions=CUBE_DIMENSIONS):
+    """Count cube of a skill_matrix over `dimensions`.
+
+    A dict with the dimension names, the labels of every dimension (in
+    axis order), the skills, "counts" (respondents using each skill in every
+    cell, dimensions x skills) and "respondents" (respondents in every cell).
+    """
+    skills = skill_columns(matrix)
+    labels = {}
+    codes = []
+    for dimension in dimensions:
+        answers = matrix[dimension].astype("category").cat
+        dimension_codes = answers.codes.to_numpy().astype(np.intp)
+        labels[dimension] = np.array([str(label) for label in answers.categories] + [MISSING])
+        codes.append(np.where(dimension_codes < 0, len(answers.categories), dimension_codes))
+
+    shape = tuple(len(labels[dimension]) for dimension in dimensions)
+    cells = int(np.prod(shape, dtype=np.int64)) * (len(skills) + 1)
+    if cells > MAX_CELLS:
+        raise ValueError(f"a cube over {dimensions} would have {cells:,} cells (more than {MAX_CELLS:,}), use fewer dimensions")
+
+    # one flat cell number per respondent, then one bincount per array
+    cell = np.ravel_multi_index(codes, shape) if dimensions else np.zeros(len(matrix), dtype=np.intp)
+    respondents, ticked = np.nonzero(matrix[skills].to_numpy())
+    n_cells = int(np.prod(shape, dtype=np.int64))
+    counts = np.bincount(cell[respondents] * len(skills) + ticked, minlength=n_cells * len(skills))
+    return {
+        "dimensions": list(dimensions),
+        "labels": labels,
+        "skills": np.array(skills),
+        "counts": counts.astype(np.int32).reshape(shape + (len(skills),)),
+        "respondents": np.bincount(cell, minlength=n_cells).astype(np.int32).reshape(shape),
+    }
+
+
+def save_cube(cube, path=CUBE_OUTPUT):
+    """Write a cube as a compressed .npz (no pickles, so load_cube needs no trust)."""
+    arrays = {f"labels_{dimension}": cube["labels"][dimension] for dimension in cube["dimensions"]}
+    with atomic_write(path, "wb") as f:
+        np.savez_compressed(f, dimensions=np.array(cube["dimensions"], dtype=str), skills=cube["skills"],
+                            counts=cube["counts"], respondents=cube["respondents"], **arrays)
+
+
+def load_cube(path=CUBE_OUTPUT):
+    """Read a cube written by save_cube."""
+    with np.load(path) as data:
+        dimensions = list(data["dimensions"])
+        return {
+            "dimensions": dimensions,
+            "labels": {dimension: data[f"labels_{dimension}"] for dimension in dimensions},
+            "skills": data["skills"],
+            "counts": data["counts"],
+            "respondents": data["respondents"],
+        }
+
+
+def select_cells(cube, array, by, selection):
+    """`array` (a cube array) restricted to `selection` and summed over every dimension but `by`."""
+    for dimension in list(selection) + [by]:
+        if dimension not in cube["dimensions"]:
+            raise ValueError(f"the cube has no {dimension!r} dimension (it has {cube['dimensions']})")
+    for axis, dimension in enumerate(cube["dimensions"]):
+        if dimension not in selection:
+            continue
+        wanted = selection[dimension]
+        wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+        labels = list(cube["labels"][dimension])
+        unknown = [label for label in wanted if label not in labels]
+        if unknown:
+            raise ValueError(f"no {dimension} answer {unknown} (answers: {labels})")
+        array = np.take(array, [labels.index(label) for label in wanted], axis=axis)
+    rolled_up = tuple(axis for axis, dimension in enumerate(cube["dimensions"]) if dimension != by)
+    return array.sum(axis=rolled_up, dtype=np.int64)
+
+
+def cube_counts(cube, by="gender", **selection):
+    """Respondents using each skill in each `by` group of the selected cells (groups x skills).
+
+    Every keyword is a dimension and the answer (or list of answers) to keep.
+    """
+    counts = select_cells(cube, cube["counts"], by, selection)
+    return pd.DataFrame(counts, index=pd.Index(cube["labels"][by], name=by), columns=list(cube["skills"]))
+
+
+def cube_respondents(cube, by="gender", **selection):
+    """Respondents in each `by` group of the selected cells."""
+    respondents = select_cells(cube, cube["respondents"], by, selection)
+    return pd.Series(respondents, index=pd.Index(cube["labels"][by], name=by), name="respondents")
+
+
+def cube_skill_shares(cube, **selection):
+    """Skill counts and shares by gender of the selected cells, laid out like build_kaggle_skills."""
+    return gender_shares(counts_long(cube_counts(cube, "gender", **selection)))
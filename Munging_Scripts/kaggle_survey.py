@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Helpers for the Kaggle survey munging (kaggle-data-munging.py)
+
+Kept in their own module so the munging script and the benchmarks can
+share them. build_kaggle_skills and stream_kaggle_skills give the clean
+skills table without writing anything.
+
+The Q16 answers are kept as a respondent x skill matrix (skill_matrix): one
+row per respondent with the profile answers as categoricals and one boolean
+column per programming skill, instead of the 18x longer melted frame.
+Filtering its rows slices by country, experience and so on; counts per
+group (skill_counts) and co-occurrence (co_occurrence) are matrix products.
+"""
+
+# importing necessary libraries
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+## Survey export (row 1 repeats the question text)
+SURVEY = "Raw_Datasets/Kaggle_WomenInDataScience/multipleChoiceResponses.csv"
+
+## for data viz purposes only Q16 and other relevant variables are kept,
+## with more descriptive names
+KEPT_COLUMNS = {
+    "Q1": "gender", "Q2": "age", "Q3": "country", "Q4": "education", "Q5": "undergrad_major",
+    "Q6": "professional_title", "Q7": "professional_industry", "Q8": "experience_years",
+    "Q9": "compensation_usd",
+    **{f"Q16_Part_{part}": f"Q16_Part_{part}" for part in range(1, 19)},
+}
+SKILL_PREFIX = "Q16_Part_"
+PROFILE_COLUMNS = [name for name in KEPT_COLUMNS.values() if not name.startswith(SKILL_PREFIX)]
+
+
+def share_within_gender(kaggle_agg, group="gender", count="counts"):
+    """Return each row's share of the total count for its gender.
+
+    Works for any number of gender categories in one groupby-transform
+    pass, so no per-row lookup into a separate totals table is needed.
+    """
+    totals = kaggle_agg.groupby(group, sort=False)[count].transform("sum")
+    return kaggle_agg[count] / totals
+
+
+def count_skills_by_gender(kaggle_tidy):
+    """Count (gender, programming_skill) pairs of the long survey frame."""
+    return (
+        kaggle_tidy.groupby(["gender", "programming_skill"])["programming_skill"]
+        .size()
+        .reset_index(name="counts")
+    )
+
+
+def stream_skill_counts(path, usecols, gender_col="Q1", skill_prefix="Q16_Part_",
+                        chunksize=50_000):
+    """Count (gender, programming_skill) pairs by reading the survey in chunks.
+
+    Only the gender and skill columns of `usecols` are parsed and each chunk is melted and counted on its own,
+    so the long frame never exists for more than one chunk at a time and peak
+    memory stays flat however large the export is. The partial counts are
+    merged into one table shaped like count_skills_by_gender's output.
+    """
+    skill_cols = [col for col in usecols if col.startswith(skill_prefix)]
+    totals = Counter()
+
+    # row 1 of the export repeats the question text, skip it like the
+    # in-memory path does
+    reader = pd.read_csv(path, usecols=[gender_col] + skill_cols, dtype="str",
+                         skiprows=[1], chunksize=chunksize)
+    for chunk in reader:
+        chunk_tidy = chunk.melt(id_vars=gender_col, value_vars=skill_cols,
+                                value_name="programming_skill")
+        chunk_counts = chunk_tidy.groupby([gender_col, "programming_skill"]).size()
+        totals.update(chunk_counts.to_dict())
+
+    kaggle_agg = pd.Series(totals, dtype="int64")
+    kaggle_agg.index = kaggle_agg.index.set_names(["gender", "programming_skill"])
+    return kaggle_agg.sort_index().reset_index(name="counts")
+
+
+def read_survey(path=SURVEY):
+    """The kept columns of the survey export, question row included."""
+    return pd.read_csv(path, usecols=list(KEPT_COLUMNS), dtype={"Q8": "str"})
+
+
+def gender_shares(kaggle_agg):
+    """Add each skill's share within its gender and keep Male and Female only.
+
+    The ratios of each of the two genders sum to 1.
+    """
+    kaggle_agg = kaggle_agg.assign(ratio=share_within_gender(kaggle_agg))
+    # for viz purposes let's only look at those who self identify as male or female
+    return kaggle_agg[(kaggle_agg.gender == "Male") | (kaggle_agg.gender == "Female")]
+
+
+def skill_matrix(kaggle):
+    """Respondent x skill matrix of the survey frame (question row dropped).
+
+    The profile columns (gender, country, experience_years, ...) become
+    categoricals and every skill named in the Q16 parts becomes a boolean
+    column (in the order of the parts) that is True for the respondents
+    who use it.
+    """
+    respondents = kaggle.iloc[1:].rename(columns=KEPT_COLUMNS)
+    answers = respondents[[col for col in respondents.columns if col.startswith(SKILL_PREFIX)]]
+
+    # factorize part by part, numbering the skills in order of first appearance
+    positions = {}
+    ticked = []
+    for part in answers:
+        codes, uniques = pd.factorize(answers[part])
+        position = np.array([positions.setdefault(skill, len(positions)) for skill in uniques], dtype=np.intp)
+        answered = codes >= 0
+        ticked.append((np.flatnonzero(answered), position[codes[answered]]))
+    used = np.zeros((len(answers), len(positions)), dtype=bool)
+    for rows, columns in ticked:
+        used[rows, columns] = True
+    skills = list(positions)
+
+    matrix = respondents[PROFILE_COLUMNS].astype("category").reset_index(drop=True)
+    return pd.concat([matrix, pd.DataFrame(used, columns=skills)], axis=1)
+
+
+def skill_columns(matrix):
+    """Names of the skill columns of a skill_matrix."""
+    return list(matrix.select_dtypes(bool).columns)
+
+
+def group_indicator(matrix, by):
+    """(groups x respondents) 0/1 matrix of the `by` categories, plus the categories."""
+    groups = matrix[by].astype("category").cat
+    return (groups.codes.to_numpy() == np.arange(len(groups.categories))[:, None]).astype(float), groups.categories
+
+
+def skill_counts(matrix, by="gender"):
+    """Respondents using each skill in each `by` group (groups x skills).
+
+    One product of the group indicator with the skill matrix (in floats, so
+    it runs through BLAS; the counts stay exact); respondents without an
+    answer for `by` are not counted.
+    """
+    indicator, groups = group_indicator(matrix, by)
+    skills = skill_columns(matrix)
+    counts = indicator @ matrix[skills].to_numpy(dtype=float)
+    return pd.DataFrame(counts.astype(np.int64), index=pd.Index(groups, name=by), columns=skills)
+
+
+def counts_long(counts):
+    """A groups x skills count frame as (group, programming_skill, counts) rows without the zeros."""
+    by = counts.index.name
+    counts = counts.rename_axis(columns="programming_skill")
+    long = counts.stack().rename("counts").reset_index()
+    long = long[long["counts"] > 0].astype({by: str, "programming_skill": str, "counts": "int64"})
+    return long.sort_values([by, "programming_skill"], ignore_index=True)
+
+
+def skill_counts_long(matrix, by="gender"):
+    """skill_counts as (by, programming_skill, counts) rows, shaped like count_skills_by_gender."""
+    return counts_long(skill_counts(matrix, by))
+
+
+def co_occurrence(matrix, by=None):
+    """Share of the users of each row skill who also use each column skill.
+
+    co_occurrence(women).loc["Python", "SQL"] is the share of women using
+    Python who also use SQL. With `by` there is one block of rows per group
+    (a (group, skill) index). Each block is one skills' x skills product.
+    """
+    skills = skill_columns(matrix)
+    used = matrix[skills].to_numpy(dtype=float)
+    if by is None:
+        blocks, groups = [used], None
+    else:
+        indicator, groups = group_indicator(matrix, by)
+        blocks = [used[member.astype(bool)] for member in indicator]
+    shares = []
+    for block in blocks:
+        both = block.T @ block
+        with np.errstate(invalid="ignore", divide="ignore"):
+            shares.append(pd.DataFrame(both / np.diag(both)[:, None], index=skills, columns=skills))
+    if groups is None:
+        return shares[0]
+    return pd.concat(shares, keys=list(groups), names=[by, "skill"])
+
+
+def build_kaggle_skills(kaggle):
+    """Count and share of every programming skill by gender from the survey frame."""
+    # now we need to summarize by gender and count of skill
+    return gender_shares(skill_counts_long(skill_matrix(kaggle)))
+
+
+def stream_kaggle_skills(path=SURVEY):
+    """build_kaggle_skills(read_survey(path)) with the survey counted chunk by chunk."""
+    return gender_shares(stream_skill_counts(path, list(KEPT_COLUMNS)))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Data Munging: OWID Female Labor Force & OECD Parental Leave
+(Python port of leave_fertility_munging.R)
+
+Reads only the columns that are kept, with explicit dtypes, through the
+pyarrow CSV engine (the OECD file through oecd_reader.py), and writes the
+same clean CSVs as the R script (write.csv layout: quoted text, the raw
+file's row numbers as row names).
+
+Run from the repository root:
+    python Munging_Scripts/leave_fertility_munging.py
+"""
+
+# importing necessary libraries
+import pandas as pd
+from clean_store import write_clean_r
+from oecd_reader import read_oecd
+
+## OWID columns kept -> clean names (code, population and continent are dropped)
+LABOR_COLUMNS = {
+    "Entity": "Country",
+    "Year": "Year",
+    "Labor force participation rate, female (% of female population ages 15+) (national estimate)": "Female_labor_force_participation_rate",
+    "Estimates, 1950 - 2020: Annually interpolated demographic indicators - Total fertility (live births per woman)": "Fertility_rate",
+}
+LABOR_DTYPES = dict(zip(LABOR_COLUMNS, [str, "int64", "float64", "float64"]))
+
+## OECD parental leave dimensions kept (plus Time and Value, which is in weeks)
+LEAVE_DIMENSIONS = ["Country", "Indicator", "Sex"]
+
+
+def read_rows(csv_path, dtypes):
+    """Read the `dtypes` columns of a raw CSV, indexed by row number from 1 (R's row names)."""
+    df = pd.read_csv(csv_path, engine="pyarrow", usecols=list(dtypes), dtype=dtypes)
+    df.index = df.index + 1
+    return df[list(dtypes)]
+
+
+def clean_labor(csv_path="Raw_Datasets/fertility-and-female-labor-force-participation.csv"):
+    """Labor force participation and fertility, rows without participation data dropped."""
+    labor = read_rows(csv_path, LABOR_DTYPES).rename(columns=LABOR_COLUMNS)
+    return labor[labor["Female_labor_force_participation_rate"].notna()]
+
+
+def clean_leave(csv_path="Raw_Datasets/OECD_ParentalLeave.csv"):
+    """Parental leave by country, indicator, sex and year (already aggregated)."""
+    leave = read_oecd(csv_path, LEAVE_DIMENSIONS, year="Time")
+    leave.index = leave.index + 1
+    return leave
+
+
+if __name__ == "__main__":
+    write_clean_r(clean_leave(), "Clean_Datasets/parental_leave_CLEAN.csv")
+    write_clean_r(clean_labor(), "Clean_Datasets/female_labor_participation_CLEAN.csv")
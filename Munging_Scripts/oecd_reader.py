@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Typed reader for the OECD (SDMX-style) CSV exports
+
+The OECD exports carry every dimension twice, as a code ("COUNTRY", "SEX")
+and as a label ("Country", "Gender"), plus flag columns. read_oecd reads only
+the columns named in a dimension spec: dimensions as categoricals, the time
+column as integers (the "Latest available year" rows are dropped while the
+years are still categories) and the values as floats. The UTF-8 byte order
+mark in front of the first header is stripped.
+"""
+
+# importing necessary libraries
+import pandas as pd
+
+## Time label the OECD uses for the latest year of every series (a copy of it)
+LATEST_YEAR = "Latest available year"
+
+
+def read_oecd(csv_path, dimensions, year="Year", values=("Value",), sentinel=LATEST_YEAR):
+    """Read the `dimensions`, `year` and `values` columns of an OECD export.
+
+    Rows keep their position in the file as index. Dimensions are
+    categoricals, `year` is int64 without the `sentinel` rows and `values`
+    are float64.
+    """
+    dtypes = {col: "category" for col in [*dimensions, year]}
+    dtypes.update({col: "float64" for col in values})
+    df = pd.read_csv(
+        csv_path, engine="pyarrow", encoding="utf-8-sig", usecols=list(dtypes), dtype=dtypes
+    )
+    # the sentinel and the year conversion only touch the categories
+    years = df[year]
+    if sentinel in years.cat.categories:
+        df = df[years != sentinel]
+        years = df[year].cat.remove_categories(sentinel)
+    return df.assign(**{year: years.astype("int64")})[list(dtypes)]
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reshape engine for the OECD students by field and gender data
+(OECD_students_munging.py)
+
+Fields are mapped to integer codes through one lookup table that also holds
+their STEM status. Male and female values are aligned as numpy arrays over
+the (country, year, field) groups, so the gender gap needs no pivot to wide
+by Gender, and the result is brought to one column per field with a single
+unstack.
+"""
+
+# importing necessary libraries
+import numpy as np
+import pandas as pd
+
+## Lookup table: field code -> field name and STEM status
+## (alphabetical, which is also the column order of OECD_LaborForce_Data.csv)
+FIELDS = pd.DataFrame(
+    [
+        ("Agriculture, forestry, fisheries and veterinary", "STEM"),
+        ("Arts and humanities", "Non-STEM"),
+        ("Business, administration and law", "Non-STEM"),
+        ("Education", "Non-STEM"),
+        ("Engineering, manufacturing and construction", "STEM"),
+        ("Generic programmes and qualifications", "Non-STEM"),
+        ("Health and welfare", "STEM"),
+        ("Information and Communication Technologies (ICTs)", "STEM"),
+        ("Natural sciences, mathematics and statistics", "STEM"),
+        ("Services", "Non-STEM"),
+        ("Social sciences, journalism and information", "Non-STEM"),
+    ],
+    columns=["Field", "STEM_Status"],
+)
+
+
+def field_codes(field):
+    """Return (codes, names): the integer code of every row and the field of every code.
+
+    Codes follow the FIELDS lookup table; fields missing from it get the
+    codes after it.
+    """
+    known = FIELDS["Field"].to_numpy(dtype=object)
+    extra = sorted(set(pd.unique(field)) - set(known))
+    names = np.concatenate([known, np.array(extra, dtype=object)])
+    return pd.Categorical(field, categories=names).codes, names
+
+
+def stem_status(codes):
+    """STEM status of field codes, " " for fields missing from the lookup table."""
+    status = np.full(len(codes), " ", dtype=object)
+    known = codes < len(FIELDS)
+    status[known] = FIELDS["STEM_Status"].to_numpy(dtype=object)[codes[known]]
+    return status
+
+
+def group_index(df, keys):
+    """Return (group, first): the group number of every row and the first row of every group.
+
+    Each key column is factorized once and the codes are combined into one
+    integer per row; groups are numbered in sorted key order, as groupby
+    numbers them.
+    """
+    combined = np.zeros(len(df), dtype=np.int64)
+    for key in keys:
+        codes, uniques = pd.factorize(df[key], sort=True)
+        combined = combined * (len(uniques) + 1) + codes
+    _, first, group = np.unique(combined, return_index=True, return_inverse=True)
+    return group, first
+
+
+def gender_gap(students_clean, keys=("COUNTRY", "Country", "Year")):
+    """Return the Male/Female values, Ratio, Difference and STEM_Status per field.
+
+    One row per `keys` + Field group (also groups that only have a Total
+    value, with NaN for Male and Female, as the pivot by Gender gave). Ratio
+    is Male / Female with a zero (instead of infinity) where only the female
+    share is 0; Difference is Male - Female in percentage points.
+    """
+    keys = list(keys)
+    codes, names = field_codes(students_clean["Field"])
+    rows, first = group_index(students_clean, keys)
+    # groups sorted by keys, then field code
+    group_key = rows.astype(np.int64) * len(names) + codes
+    slots, first_of_slot, group = np.unique(group_key, return_index=True, return_inverse=True)
+    gender = pd.Categorical(students_clean["Gender"])
+    value = students_clean["Value"].to_numpy(dtype=float)
+
+    # same check as DataFrame.pivot: one value per group and gender
+    slot = group * len(gender.categories) + gender.codes
+    if len(np.unique(slot)) != len(slot):
+        raise ValueError("more than one value per group and gender")
+
+    is_male = gender == "Male"
+    is_female = gender == "Female"
+    male = np.full(len(slots), np.nan)
+    female = np.full(len(slots), np.nan)
+    male[group[is_male]] = value[is_male]
+    female[group[is_female]] = value[is_female]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = male / female
+    ratio[np.isinf(ratio)] = 0
+
+    field_code = slots % len(names)
+    students_wide = students_clean[keys].iloc[first_of_slot].reset_index(drop=True)
+    students_wide["Field"] = names[field_code]
+    students_wide["Female"] = female
+    students_wide["Male"] = male
+    students_wide["Ratio"] = ratio
+    students_wide["Difference"] = male - female
+    students_wide["STEM_Status"] = stem_status(field_code)
+    return students_wide
+
+
+def difference_by_field(students_wide, keys=("COUNTRY", "Country", "Year")):
+    """One row per `keys` group and one Difference column per field (sorted by name).
+
+    The Difference values are scattered into a groups x fields matrix, like
+    an unstack by Field without building a MultiIndex.
+    """
+    keys = list(keys)
+    row, first = group_index(students_wide, keys)
+    column, fields = pd.factorize(students_wide["Field"], sort=True)
+    difference = np.full((len(first), len(fields)), np.nan)
+    difference[row, column] = students_wide["Difference"].to_numpy(dtype=float)
+    index = pd.MultiIndex.from_frame(students_wide[keys].iloc[first])
+    return pd.DataFrame(difference, index=index, columns=list(fields))
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Munging for the OECD PISA test scores (Python port of oecd_test_score_munging.R)
+
+Reads only the kept columns of the math, reading and science files straight
+out of Raw_Datasets/OECD_TestScores.zip (no extraction; a directory with the
+extracted files works too), with explicit dtypes, through the pyarrow CSV
+engine, and writes the same
+Clean_Datasets/OECD_Test_Scores_Clean.csv as the R script: one row per
+country, subject, gender and year with the country's total score over the
+subjects and its rank among the countries for that gender and year.
+
+Run from the repository root:
+    python Munging_Scripts/oecd_test_score_munging.py [Raw_Datasets/OECD_TestScores.zip]
+"""
+
+# importing necessary libraries
+import os
+import sys
+import zipfile
+
+import numpy as np
+import pandas as pd
+from clean_store import write_clean
+
+## Raw archive and its subject files, in the order the R script combined them
+SOURCE = "Raw_Datasets/OECD_TestScores.zip"
+SUBJECT_FILES = ["OECD_MathScores.csv", "OECD_ReadingScores.csv", "OECD_ScienceScores.csv"]
+
+## Raw columns kept -> clean names (measure, frequency and flags are dropped)
+COLUMNS = {
+    "LOCATION": "country_code",
+    "INDICATOR": "subject",
+    "SUBJECT": "gender",
+    "TIME": "year",
+    "Value": "test_score",
+}
+DTYPES = {"LOCATION": str, "INDICATOR": str, "SUBJECT": str, "TIME": "int64", "Value": "float64"}
+
+## Aggregates that are not countries: they are not ranked and the test scores
+## chart computes its own average (the clean dataset never had these rows)
+AGGREGATES = ["OAVG"]
+
+
+def read_subject(csv_file):
+    """Kept columns of one subject file (a path or an open file)."""
+    return pd.read_csv(csv_file, engine="pyarrow", usecols=list(DTYPES), dtype=DTYPES)
+
+
+def read_scores(source=SOURCE):
+    """All subjects in one frame with the clean column names, aggregates dropped.
+
+    source is the zip archive (its members are read without extracting them)
+    or a directory holding the extracted files.
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            subjects = []
+            for name in SUBJECT_FILES:
+                with archive.open(name) as csv_file:
+                    subjects.append(read_subject(csv_file))
+    else:
+        subjects = [read_subject(os.path.join(source, name)) for name in SUBJECT_FILES]
+    all_subject = pd.concat(subjects, ignore_index=True)
+    all_subject = all_subject[~all_subject["LOCATION"].isin(AGGREGATES)]
+    return all_subject[list(COLUMNS)].rename(columns=COLUMNS).reset_index(drop=True)
+
+
+def clean_scores(all_subject):
+    """Lowercase subject ("PISAMATH" -> "math") and gender, add sum_total_score and rank.
+
+    sum_total_score is the country's score summed over the subjects (per
+    gender and year); rank is its dense rank, highest first, among the
+    countries for that gender and year. Rows are sorted by year and
+    sum_total_score, ties kept in file order.
+    """
+    all_subject = all_subject.assign(
+        subject=all_subject["subject"].str[4:].str.lower(),
+        gender=all_subject["gender"].str.lower(),
+    )
+    ## plain sums in row order, as dplyr's sum() gives them (the compensated
+    ## groupby sum of pandas can differ in the last digit)
+    group = all_subject.groupby(["country_code", "gender", "year"]).ngroup().to_numpy()
+    totals = np.zeros(group.max() + 1)
+    np.add.at(totals, group, all_subject["test_score"].to_numpy())
+    all_subject["sum_total_score"] = totals[group]
+    all_subject = all_subject.sort_values(["year", "sum_total_score"], kind="stable", ignore_index=True)
+    all_subject["rank"] = (
+        all_subject.groupby(["gender", "year"])["sum_total_score"]
+        .rank(method="dense", ascending=False)
+        .astype(int)
+    )
+    return all_subject
+
+
+def readr_number(x):
+    """A double as readr's write_csv writes it: shortest round trip, no ".0" for whole numbers."""
+    return str(int(x)) if x.is_integer() else repr(x)
+
+
+if __name__ == "__main__":
+    write_clean(
+        clean_scores(read_scores(*sys.argv[1:2])),
+        "Clean_Datasets/OECD_Test_Scores_Clean.csv",
+        float_format=readr_number,
+    )
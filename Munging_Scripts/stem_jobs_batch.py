@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch munging of Census STEM occupation workbooks (stem_jobs_munging.py over a directory)
+
+Every .xlsx under the directory is parsed in a process pool, tidied as in
+stem_jobs_munging.py and checked: each cell of the numeric columns must be a
+number or a Census marker ("-", "(X)", "250,000+", ...). The tables are
+stacked into one tidy table with year and geography in front:
+
+- year: the survey year in the table title ("... ACS 2019"), else the first
+  year-like folder or file name in the workbook's path
+- geography: the innermost folder (below the directory) that is not a year,
+  "United States" for workbooks with none, e.g.
+  <directory>/2019/California/Table1.xlsx -> 2019, California
+
+Per-file timings are printed as the workbooks finish.
+
+Run from the repository root:
+    python Munging_Scripts/stem_jobs_batch.py <directory> [Clean_Datasets/STEM_jobs_batch.csv] [--jobs N]
+"""
+
+# importing necessary libraries
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import openpyxl
+import pandas as pd
+from clean_store import write_clean
+from stem_jobs_parsing import non_numeric_cells, read_census_table, tidy_stem_jobs
+
+## Output of the batch and the geography of workbooks outside any folder
+OUTPUT = "Clean_Datasets/STEM_jobs_batch.csv"
+NATIONAL = "United States"
+
+## "ACS 2019" in the title (the footnote digit is glued on: "ACS 20191");
+## a year on its own in a path component
+TITLE_YEAR = re.compile(r"\bACS (\d{4})")
+PATH_YEAR = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+
+def title_year(path, max_rows=5):
+    """Survey year in the title rows at the top of the workbook (None when there is none).
+
+    The title ("Table 1. ... ACS 2019") comes after a screen reader note, so
+    the first `max_rows` rows are searched.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(max_row=max_rows, values_only=True):
+            for value in row:
+                match = TITLE_YEAR.search(value) if isinstance(value, str) else None
+                if match:
+                    return int(match.group(1))
+    finally:
+        workbook.close()
+    return None
+
+
+def workbook_year(path):
+    """Survey year from the title, else from the path (None when neither has one)."""
+    year = title_year(path)
+    if year is None:
+        match = PATH_YEAR.search(path)
+        year = int(match.group(1)) if match else None
+    return year
+
+
+def workbook_geography(path, directory):
+    """Innermost folder between `directory` and the workbook that is not a year."""
+    folders = os.path.relpath(os.path.dirname(path), directory).split(os.sep)
+    names = [name for name in folders if name != os.curdir and not PATH_YEAR.fullmatch(name)]
+    return names[-1] if names else NATIONAL
+
+
+def munge_workbook(path, directory):
+    """Tidy table of one workbook with its year and geography, plus the seconds it took.
+
+    Raises ValueError when the year is unknown or a numeric cell does not parse.
+    """
+    start = time.perf_counter()
+    year = workbook_year(path)
+    if year is None:
+        raise ValueError(f"{path}: no survey year in the title or the path")
+    STEM_jobs = tidy_stem_jobs(read_census_table(path))
+    bad = non_numeric_cells(STEM_jobs)
+    if len(bad):
+        cells = ", ".join(f"row {row} {column}={value!r}" for (row, column), value in bad.head(5).items())
+        raise ValueError(f"{path}: {len(bad)} non-numeric cells ({cells})")
+    STEM_jobs.insert(0, "geography", workbook_geography(path, directory))
+    STEM_jobs.insert(0, "year", year)
+    return STEM_jobs, time.perf_counter() - start
+
+
+def find_workbooks(directory):
+    """The .xlsx files under `directory`, sorted (Excel's "~$" lock files skipped)."""
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(".xlsx") and not name.startswith("~$")
+    )
+
+
+def munge_directory(directory, jobs=None):
+    """One tidy table over every workbook under `directory`, sorted by year and geography.
+
+    Workbooks are parsed in a pool of `jobs` processes (os.cpu_count() by
+    default); the timing of each one is printed as it finishes.
+    """
+    paths = find_workbooks(directory)
+    if not paths:
+        raise ValueError(f"no .xlsx workbooks under {directory}")
+    tables = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(munge_workbook, path, directory): path for path in paths}
+        for future in as_completed(futures):
+            table, seconds = future.result()
+            tables[futures[future]] = table
+            print(f"{seconds:8.3f}s  {len(table):5d} rows  {futures[future]}")
+    # concatenated in path order so the result does not depend on scheduling;
+    # the stable sort keeps each workbook's rows together and in sheet order
+    STEM_jobs = pd.concat([tables[path] for path in paths])
+    return STEM_jobs.sort_values(["year", "geography"], kind="stable", ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("directory", help="directory searched for .xlsx Census STEM tables")
+    parser.add_argument("output", nargs="?", default=OUTPUT, help=f"tidy CSV to write (default: {OUTPUT})")
+    parser.add_argument("-j", "--jobs", type=int, help="workbooks parsed at the same time (default: number of CPUs)")
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    start = time.perf_counter()
+    try:
+        STEM_jobs = munge_directory(args.directory, args.jobs)
+    except ValueError as err:
+        parser.error(str(err))
+    write_clean(STEM_jobs, args.output)
+    print(f"{time.perf_counter() - start:8.3f}s  {len(STEM_jobs):5d} rows  -> {args.output}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Helpers for parsing the Census STEM occupation tables (stem_jobs_munging.py)
+
+In these tables a row whose label ends with ":" is a category header and the
+rows below it belong to that category until the next header. Leading dots in
+the raw labels give the nesting level (".Total STEM Occupations:",
+"..Computer Occupations:", "...Web developers").
+
+The workbooks are streamed with openpyxl in read-only mode: the table body
+is found from its content (the "Estimate" row above it, the first category
+header and the blank row after it), only the label and estimate columns are
+kept and nothing after the body is read. Parsed tables are cached by the
+SHA-256 of the workbook.
+
+tidy_stem_jobs turns a parsed table into the STEM_jobs.csv layout, for
+stem_jobs_munging.py (one workbook) and stem_jobs_batch.py (a directory).
+"""
+
+# importing necessary libraries
+import hashlib
+import os
+import re
+
+import openpyxl
+import pandas as pd
+from atomic_file import atomic_write
+
+## Parsed tables are cached in .excel_cache at the repository root (wherever
+## the script is run from), one pickle per workbook content; bump
+## CACHE_VERSION when the parsing changes
+CACHE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".excel_cache"))
+CACHE_VERSION = 1
+
+## Clean names of the label and estimate columns, in sheet order
+STEM_JOBS_COLUMNS = ['occupation',
+                     'total_employed', 'men_employed', 'women_employed', 'percent_of_women',
+                     'total_median_earnings', 'men_earnings', 'women_earnings', 'percent_of_men_earnings']
+
+## Census markers allowed in place of a number: "-" (too few sample cases),
+## "(X)" (not applicable), "(Z)" (rounds to zero), "**" / "***" (no margin of
+## error) and top-coded values such as "250,000+"
+CENSUS_MARKERS = re.compile(r"-|\(X\)|\(Z\)|\*{2,3}|[\d,]+\+")
+
+
+def workbook_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a workbook's bytes."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cell_value(value):
+    """A cell as pd.read_excel gives it: whole-number floats become ints."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def parse_census_table(path, unit_label="Estimate", marker=":"):
+    """Return the body of a Census table: the label column plus the estimate columns.
+
+    The estimate columns are the ones labeled `unit_label` in the units row
+    (the margin of error columns are left out). The body starts at the first
+    category header below that row and ends before the next blank row.
+    Columns keep their position in the sheet as names and, as with
+    pd.read_excel(header=None), hold the cells as objects.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    columns, body = None, []
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            if columns is None:
+                if unit_label in row:
+                    columns = [0] + [i for i, value in enumerate(row) if value == unit_label]
+                continue
+            if not body:
+                label = row[0]
+                if not (isinstance(label, str) and label.rstrip().endswith(marker)):
+                    continue
+            elif all(value is None for value in row):
+                break
+            body.append([cell_value(row[i]) if i < len(row) else None for i in columns])
+    finally:
+        workbook.close()
+    if columns is None:
+        raise ValueError(f"no {unit_label!r} row in {path}")
+    return pd.DataFrame(body, columns=columns, dtype=object)
+
+
+def read_census_table(path, cache_dir=CACHE_DIR):
+    """parse_census_table, cached by the workbook's content hash."""
+    cache_path = os.path.join(cache_dir, f"{workbook_hash(path)}-v{CACHE_VERSION}.pkl")
+    if os.path.exists(cache_path):
+        return pd.read_pickle(cache_path)
+    table = parse_census_table(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # parallel batch workers may read the cache while it is written
+    with atomic_write(cache_path, "wb") as f:
+        table.to_pickle(f)
+    return table
+
+
+def fill_occupation_categories(occupation, marker=":"):
+    """Return the closest header above each row (the header itself for header rows).
+
+    Header rows are found with one vectorized str.contains and carried down
+    with ffill, so there is no Python loop over the rows.
+    """
+    is_header = occupation.str.contains(marker, regex=False, na=False)
+    return occupation.where(is_header).ffill()
+
+
+def fill_category_levels(raw_labels, indent_char=".", marker=":"):
+    """Return one forward-filled category column per nesting level.
+
+    `raw_labels` are the labels with their leading dots still on. Column
+    "level_<n>" holds the current header of depth n for every row. Any other
+    row at depth n or shallower closes that header, so
+    ".Total non-STEM Occupations" does not inherit the categories of the
+    STEM-related block above it.
+    """
+    labels = raw_labels.str.lstrip(indent_char)
+    depth = raw_labels.str.len() - labels.str.len()
+    is_header = labels.str.contains(marker, regex=False, na=False)
+    labels = labels.str.strip().str.rstrip(marker)
+
+    levels = pd.DataFrame(index=raw_labels.index)
+    for level in sorted(depth[is_header].unique()):
+        own_header = is_header & (depth == level)
+        closes = ~own_header & (depth <= level)
+        # an empty string marks a closed level so ffill stops there
+        current = labels.where(own_header).mask(closes, "").ffill()
+        levels[f"level_{level}"] = current.mask(current == "")
+    return levels
+
+
+def tidy_stem_jobs(table):
+    """STEM_jobs.csv layout of a parsed table: one row per occupation with its category.
+
+    Columns get the STEM_JOBS_COLUMNS names, the leading dots are stripped
+    from the labels, every occupation gets the closest category header above
+    it (without its ":") and the header rows are dropped.
+    """
+    STEM_jobs = table.set_axis(STEM_JOBS_COLUMNS, axis=1)
+
+    # remove "..." from occupation column
+    STEM_jobs['occupation'] = STEM_jobs.occupation.str.strip('...')
+
+    # create new column for occupation categories: rows with ":" are category headers,
+    # carry each header down to the occupations below it, in second position
+    STEM_jobs.insert(1, 'occupation_category', fill_occupation_categories(STEM_jobs['occupation']))
+
+    # remove ":"
+    STEM_jobs = STEM_jobs[STEM_jobs["occupation"].str.contains(":") == False]
+    STEM_jobs['occupation_category'] = STEM_jobs.occupation_category.str.strip(':')
+    return STEM_jobs
+
+
+def non_numeric_cells(STEM_jobs, columns=STEM_JOBS_COLUMNS[1:]):
+    """Cells of the numeric columns that are neither a number nor a Census marker.
+
+    Returns a Series of the offending values indexed by (row, column); empty
+    when every cell parses.
+    """
+    cells = STEM_jobs[list(columns)].stack(dropna=False)
+    text = cells.astype(str).str.strip()
+    numbers = pd.to_numeric(text.str.replace(",", "", regex=False), errors="coerce")
+    return cells[numbers.isna() & ~text.str.fullmatch(CENSUS_MARKERS)]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chart table for the PISA test scores chart (altair_test_scores.py)
+
+Pre-aggregates Clean_Datasets/OECD_Test_Scores_Clean.csv once per PISA
+cycle: the per-country series plus the cross-country "ALL" average, with
+subject and gender relabeled through a dictionary over their categories and
+the rows already sorted by country code for the dropdown. The chart script
+only reads the result, Clean_Datasets/OECD_Test_Scores_Chart.csv.
+
+Run from the repository root:
+    python Munging_Scripts/test_scores_aggregate.py
+"""
+
+# importing necessary libraries
+import pandas as pd
+from clean_store import write_clean
+from country_index import PISA_SPARSE, is_member
+
+## Chart labels of the subject and gender values
+SUBJECT_LABELS = {"read": "Reading", "math": "Math", "science": "Science"}
+GENDER_LABELS = {"boy": "Boy", "girl": "Girl", "tot": "Total"}
+
+## Country code of the cross-country average series (the dropdown default)
+AVERAGE_CODE = "ALL"
+
+
+def relabel(values, labels):
+    """Categorical of values with its categories renamed through labels.
+
+    The lookup runs once per category instead of once per row; values
+    without a label keep their name.
+    """
+    return pd.Categorical(values).rename_categories(labels)
+
+
+def chart_table(testscores):
+    """Return the chart table: one row per country (or ALL), subject, gender and year.
+
+    Country_Code, Subject and Gender are categoricals, Test_Score is rounded
+    to two decimals and the rows are sorted by country code, subject, gender
+    and year.
+    """
+    keys = ["subject", "gender", "year"]
+    scores = testscores.loc[
+        ~is_member(testscores["country_code"], PISA_SPARSE), ["country_code"] + keys + ["test_score"]
+    ]
+
+    ## Average test score over all remaining countries
+    average = scores.groupby(keys, observed=True)["test_score"].mean().reset_index()
+    average.insert(0, "country_code", AVERAGE_CODE)
+    scores = pd.concat([average, scores], ignore_index=True)
+
+    table = pd.DataFrame(
+        {
+            "Country_Code": pd.Categorical(scores["country_code"].astype(str)),
+            "Subject": relabel(scores["subject"], SUBJECT_LABELS),
+            "Gender": relabel(scores["gender"], GENDER_LABELS),
+            "Year": scores["year"].astype(int),
+            "Test_Score": scores["test_score"].round(decimals=2),
+        }
+    )
+    return table.sort_values(["Country_Code", "Subject", "Gender", "Year"], ignore_index=True)
+
+
+if __name__ == "__main__":
+    testscores = pd.read_csv("Clean_Datasets/OECD_Test_Scores_Clean.csv")
+    write_clean(chart_table(testscores), "Clean_Datasets/OECD_Test_Scores_Chart.csv")
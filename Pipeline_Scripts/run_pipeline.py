@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental rebuild of Clean_Datasets/ and Final_Viz/
+
+Every munging and analysis script is a stage with the files it reads and the
+files it writes. Stages are chained through those files (a stage that reads
+a clean dataset runs after the stage that writes it) and only stale stages
+are re-run: a stage is stale when one of its outputs is missing or when the
+content of one of its inputs (raw data, clean data or the scripts
+themselves) changed since its last successful run.
+
+Inputs are fingerprinted by SHA-256. The hash is only recomputed when the
+file's mtime or size changed, so an up-to-date tree is checked with a stat
+per file.
+
+Stages whose inputs are ready run concurrently (--jobs), so the independent
+munge -> chart chains (Kaggle skills, STEM jobs, OECD students, OECD test
+scores, fertility/labor, parental leave) use all cores. Wall time and peak
+RSS are reported for every stage that ran.
+
+Run from the repository root:
+    python Pipeline_Scripts/run_pipeline.py              # rebuild stale stages
+    python Pipeline_Scripts/run_pipeline.py --dry-run    # only show what is stale
+    python Pipeline_Scripts/run_pipeline.py --force test_scores_chart
+    python Pipeline_Scripts/run_pipeline.py --jobs 1    # one stage at a time
+    python Pipeline_Scripts/run_pipeline.py --report usage.json   # per-stage status as JSON
+"""
+
+# importing necessary libraries
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+## Repository root, all paths below are relative to it
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+## Fingerprints of the last successful run of every stage
+STATE_FILE = ".pipeline_state.json"
+
+## Dependency graph: scripts (or [script, args...]) run in order from the
+## repository root, "inputs" are read, "outputs" must exist afterwards and
+## "moves" relocate files the scripts write to the working directory (moved
+## only if they were written; a key can be a glob pattern or a directory and a
+## target ending in "/" is the directory to move into). The Plotly charts run
+## with --shared-js (the OECD map also with --compact), and the shared
+## plotly.js assets are moved next to the pages that load them
+STAGES = {
+    "kaggle_munging": {
+        "run": ["Munging_Scripts/kaggle-data-munging.py"],
+        "inputs": [
+            "Raw_Datasets/Kaggle_WomenInDataScience/multipleChoiceResponses.csv",
+            "Munging_Scripts/kaggle_survey.py",
+            "Munging_Scripts/kaggle_cube.py",
+            "Munging_Scripts/kaggle_bootstrap.py",
+            "Munging_Scripts/atomic_file.py",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": [
+            "Clean_Datasets/Kaggle_WomenInDataScience_viz.csv",
+            "Clean_Datasets/Kaggle_skills_cube.npz",
+            "Clean_Datasets/Kaggle_skill_gaps.csv",
+        ],
+    },
+    "kaggle_chart": {
+        "run": [["Analysis_Scripts/plotly_tech_skills.py", "--shared-js"]],
+        "inputs": [
+            "Clean_Datasets/Kaggle_WomenInDataScience_viz.csv",
+            "Analysis_Scripts/plotly_assets.py",
+            "Munging_Scripts/kaggle_cube.py",
+            "Munging_Scripts/kaggle_survey.py",
+            "Munging_Scripts/atomic_file.py",
+            "Analysis_Scripts/clean_data.py",
+        ],
+        "outputs": ["Final_Viz/kaggle_prog_skills.html"],
+        "moves": {
+            "kaggle_prog_skills.html": "Final_Viz/kaggle_prog_skills.html",
+            "plotly-*.min.js": "Final_Viz/",
+        },
+    },
+    "stem_munging": {
+        "run": ["Munging_Scripts/stem_jobs_munging.py"],
+        "inputs": [
+            "Raw_Datasets/Table1_STEM _STEM-Related_Occupations (1).xlsx",
+            "Munging_Scripts/stem_jobs_parsing.py",
+            "Munging_Scripts/atomic_file.py",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": ["Clean_Datasets/STEM_jobs.csv"],
+        "moves": {
+            "STEM_jobs.csv": "Clean_Datasets/STEM_jobs.csv",
+            "STEM_jobs.feather": "Clean_Datasets/STEM_jobs.feather",
+        },
+    },
+    "stem_chart": {
+        "run": [["Analysis_Scripts/plotly_stem_occupations.R", "--shared-js"]],
+        "inputs": ["Clean_Datasets/STEM_jobs.csv"],
+        "outputs": ["Final_Viz/STEM_jobs.html"],
+        "moves": {"STEM_jobs.html": "Final_Viz/STEM_jobs.html", "lib": "Final_Viz/lib"},
+    },
+    "oecd_students_munging": {
+        "run": ["Munging_Scripts/OECD_students_munging.py"],
+        "inputs": [
+            "Raw_Datasets/OECD_StudentsByGenderField.csv",
+            "Munging_Scripts/oecd_students.py",
+            "Munging_Scripts/oecd_reader.py",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": ["Clean_Datasets/OECD_LaborForce_Data.csv"],
+    },
+    "oecd_students_chart": {
+        "run": [["Analysis_Scripts/plotly_labor_entrance_novel.py", "--compact", "--shared-js"]],
+        "inputs": [
+            "Clean_Datasets/OECD_LaborForce_Data.csv",
+            "Analysis_Scripts/choropleth_controls.py",
+            "Analysis_Scripts/plotly_assets.py",
+            "Munging_Scripts/atomic_file.py",
+            "Analysis_Scripts/geo_assets.py",
+            "Analysis_Scripts/clean_data.py",
+        ],
+        "outputs": ["Final_Viz/OECD_Novel_Viz.html"],
+        "moves": {
+            "OECD_Novel_Viz.html": "Final_Viz/OECD_Novel_Viz.html",
+            "plotly-*.min.js": "Final_Viz/",
+        },
+    },
+    "test_scores_munging": {
+        "run": ["Munging_Scripts/oecd_test_score_munging.py"],
+        "inputs": [
+            "Raw_Datasets/OECD_TestScores.zip",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": ["Clean_Datasets/OECD_Test_Scores_Clean.csv"],
+    },
+    "test_scores_aggregate": {
+        "run": ["Munging_Scripts/test_scores_aggregate.py"],
+        "inputs": [
+            "Clean_Datasets/OECD_Test_Scores_Clean.csv",
+            "Munging_Scripts/country_index.py",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": ["Clean_Datasets/OECD_Test_Scores_Chart.csv"],
+    },
+    "test_scores_chart": {
+        "run": ["Analysis_Scripts/altair_test_scores.py"],
+        "inputs": [
+            "Clean_Datasets/OECD_Test_Scores_Chart.csv",
+            "Analysis_Scripts/clean_data.py",
+        ],
+        "outputs": ["Final_Viz/test_scores_altair.html"],
+        "moves": {"test_scores_altair.html": "Final_Viz/test_scores_altair.html"},
+    },
+    "leave_fertility_munging": {
+        "run": ["Munging_Scripts/leave_fertility_munging.py"],
+        "inputs": [
+            "Raw_Datasets/fertility-and-female-labor-force-participation.csv",
+            "Raw_Datasets/OECD_ParentalLeave.csv",
+            "Munging_Scripts/oecd_reader.py",
+            "Munging_Scripts/clean_store.py",
+        ],
+        "outputs": [
+            "Clean_Datasets/female_labor_participation_CLEAN.csv",
+            "Clean_Datasets/parental_leave_CLEAN.csv",
+        ],
+    },
+    "fertility_chart": {
+        "run": ["Analysis_Scripts/altair_fertility_participation.py"],
+        "inputs": [
+            "Clean_Datasets/female_labor_participation_CLEAN.csv",
+            "Analysis_Scripts/dashboard_aggregates.py",
+            "Munging_Scripts/country_index.py",
+            "Analysis_Scripts/clean_data.py",
+        ],
+        "outputs": ["Final_Viz/fertility_part_dashboard.html"],
+        "moves": {"fertility_part_dashboard.html": "Final_Viz/fertility_part_dashboard.html"},
+    },
+    "parental_leave_chart": {
+        "run": [["Analysis_Scripts/plotly_parental_leave.R", "--shared-js"]],
+        "inputs": ["Clean_Datasets/parental_leave_CLEAN.csv"],
+        "outputs": ["Final_Viz/parental_Leave.html"],
+        "moves": {"parental_Leave.html": "Final_Viz/parental_Leave.html", "lib": "Final_Viz/lib"},
+    },
+}
+
+
+def stage_inputs(stage):
+    """Everything a stage depends on: its scripts plus its declared inputs."""
+    scripts = [step if isinstance(step, str) else step[0] for step in STAGES[stage]["run"]]
+    return scripts + STAGES[stage]["inputs"]
+
+
+def upstream(stage):
+    """Stages that write one of this stage's inputs."""
+    inputs = set(stage_inputs(stage))
+    return [name for name, spec in STAGES.items() if inputs & set(spec["outputs"])]
+
+
+def build_order(targets=None):
+    """Topological order of the requested stages and everything they depend on."""
+    order, visiting = [], set()
+
+    def visit(stage):
+        if stage in order:
+            return
+        if stage in visiting:
+            raise ValueError(f"dependency cycle through {stage}")
+        visiting.add(stage)
+        for parent in upstream(stage):
+            visit(parent)
+        visiting.discard(stage)
+        order.append(stage)
+
+    for stage in targets or STAGES:
+        visit(stage)
+    return order
+
+
+def load_state():
+    if os.path.exists(STATE_FILE):
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    return {"files": {}, "stages": {}}
+
+
+def save_state(state):
+    with open(STATE_FILE, "w") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+
+
+def fingerprint(path, state):
+    """SHA-256 of a file, reusing the stored hash while mtime and size match."""
+    stat = os.stat(path)
+    cached = state["files"].get(path)
+    if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+        return cached["sha256"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    state["files"][path] = {
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest.hexdigest(),
+    }
+    return digest.hexdigest()
+
+
+def stale_reason(stage, state, force=False):
+    """Why a stage has to run, or None when it is up to date.
+
+    Raises FileNotFoundError when one of its inputs does not exist.
+    """
+    missing = [path for path in stage_inputs(stage) if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(", ".join(missing))
+    if force:
+        return "forced"
+    previous = state["stages"].get(stage)
+    if previous is None:
+        return "never built"
+    for path in STAGES[stage]["outputs"]:
+        if not os.path.exists(path):
+            return f"missing output {path}"
+    for path in stage_inputs(stage):
+        if previous.get(path) != fingerprint(path, state):
+            return f"changed {path}"
+    return None
+
+
+def script_command(step):
+    """Command line for one entry of a stage's "run" list (a script or [script, args...])."""
+    script, *script_args = [step] if isinstance(step, str) else step
+    interpreter = ["Rscript"] if script.endswith(".R") else [sys.executable]
+    return interpreter + [script] + script_args
+
+
+def run_command(command):
+    """Run one script, returning its wall time (s) and peak RSS (MB, None if unknown)."""
+    start = time.perf_counter()
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr)
+        if hasattr(os, "wait4"):
+            # wait4 returns the resource usage of exactly this child
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            peak_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        else:
+            proc.wait()
+            peak_rss = None
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                proc.returncode, command, stderr=stderr.read().decode(errors="replace")
+            )
+    return time.perf_counter() - start, peak_rss
+
+
+def move_into_place(written, final):
+    """Move a file or directory a script wrote to `final`, replacing what is there.
+
+    A directory is merged into an existing one (e.g. the lib/ of several
+    htmlwidgets pages); `final` ending in "/" is the directory to move into.
+    """
+    if final.endswith("/"):
+        final = os.path.join(final, os.path.basename(written))
+    if written == final:
+        return
+    try:
+        if os.path.isdir(written):
+            shutil.copytree(written, final, dirs_exist_ok=True)
+            shutil.rmtree(written)
+        else:
+            shutil.move(written, final)
+    except FileNotFoundError:
+        # a stage running alongside (both write the shared plotly.js) moved it first
+        pass
+
+
+def run_stage(stage):
+    """Run the scripts of one stage and move their outputs into place.
+
+    Returns the stage's total wall time and the peak RSS of its largest script.
+    """
+    spec = STAGES[stage]
+    wall, peak_rss = 0.0, None
+    for step in spec["run"]:
+        step_wall, step_rss = run_command(script_command(step))
+        wall += step_wall
+        if step_rss is not None:
+            peak_rss = max(peak_rss or 0.0, step_rss)
+    for written, final in spec.get("moves", {}).items():
+        for path in glob.glob(written):
+            move_into_place(path, final)
+    for path in spec["outputs"]:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{stage} did not write {path}")
+    return wall, peak_rss
+
+
+def format_usage(wall, peak_rss):
+    if peak_rss is None:
+        return f"{wall:.1f}s"
+    return f"{wall:.1f}s, peak RSS {peak_rss:.0f} MB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("stages", nargs="*", help="stages to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="re-run the selected stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only report which stages are stale")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="stages to run at the same time (default: number of CPUs)")
+    parser.add_argument("--report", help="write each stage's status, wall time and peak RSS to this JSON file")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    report_path = os.path.abspath(args.report) if args.report else None
+    os.chdir(ROOT)
+    state = load_state()
+    order = build_order(args.stages)
+    waiting = list(order)
+    finished, failed, pending = set(), set(), set()
+    running, usage, report = {}, {}, {}
+    start = time.perf_counter()
+
+    # each stage runs in its own process, the pool threads only start the
+    # scripts and wait on them; a stage is scheduled once its upstream
+    # stages are finished, so independent chains run side by side
+    with ThreadPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        while waiting or running:
+            for stage in list(waiting):
+                parents = set(upstream(stage)) & set(order)
+                if not parents <= finished | failed:
+                    continue
+                waiting.remove(stage)
+                if parents & failed:
+                    print(f"{stage:<26} skipped (upstream failed)")
+                    report[stage] = {"status": "skipped: upstream failed"}
+                    failed.add(stage)
+                    continue
+                forced = args.force and (not args.stages or stage in args.stages)
+                try:
+                    reason = stale_reason(stage, state, force=forced)
+                except FileNotFoundError as err:
+                    # e.g. the Kaggle survey export is not checked in: keep the
+                    # existing outputs and carry on with the stages downstream
+                    print(f"{stage:<26} skipped (missing input: {err})")
+                    report[stage] = {"status": f"skipped: missing {err}"}
+                    finished.add(stage)
+                    continue
+                if args.dry_run:
+                    if reason is None and pending & parents:
+                        # whether it rebuilds depends on what the upstream stage writes
+                        reason = "if upstream output changes"
+                    if reason is not None:
+                        print(f"{stage:<26} stale ({reason})")
+                        report[stage] = {"status": f"stale: {reason}"}
+                        pending.add(stage)
+                        finished.add(stage)
+                        continue
+                if reason is None:
+                    print(f"{stage:<26} up to date")
+                    report[stage] = {"status": "up to date"}
+                    finished.add(stage)
+                    continue
+                print(f"{stage:<26} rebuilding ({reason})", flush=True)
+                running[pool.submit(run_stage, stage)] = stage
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    usage[stage] = future.result()
+                except (subprocess.CalledProcessError, OSError) as err:
+                    print(f"{stage:<26} FAILED: {err}")
+                    if getattr(err, "stderr", None):
+                        print(err.stderr.rstrip())
+                    report[stage] = {"status": f"failed: {err}"}
+                    failed.add(stage)
+                    continue
+                print(f"{stage:<26} rebuilt ({format_usage(*usage[stage])})", flush=True)
+                report[stage] = dict(zip(["status", "wall_s", "peak_rss_mb"], ["rebuilt", *usage[stage]]))
+                state["stages"][stage] = {path: fingerprint(path, state) for path in stage_inputs(stage)}
+                save_state(state)
+                finished.add(stage)
+
+    if usage:
+        print(f"\n{'stage':<26} {'wall (s)':>9} {'peak RSS (MB)':>14}")
+        for stage in order:
+            if stage in usage:
+                wall, peak_rss = usage[stage]
+                rss = "n/a" if peak_rss is None else f"{peak_rss:.0f}"
+                print(f"{stage:<26} {wall:>9.1f} {rss:>14}")
+        print(f"{'total elapsed':<26} {time.perf_counter() - start:>9.1f}")
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump({stage: report[stage] for stage in order if stage in report}, f, indent=1)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())